@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+解析后端基准测试：BeautifulSoup(html.parser) vs lxml
+
+用法:
+  python3 bench_parsers.py --save          # 抓取当前页面保存为 fixtures/html 下的样本
+  python3 bench_parsers.py                 # 对已保存的样本做基准测试（没有样本时报错退出）
+  python3 bench_parsers.py --synthetic 40  # 用合成页面（每页 40 条）测试，仅作冒烟测试
+
+加速比以真实页面样本为准：合成页面结构简单，结果不能代表线上页面
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import fetch_news
+import fetch_hotsearch
+import lxml_parsers
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures' / 'html'
+
+# 样本文件名前缀 -> 解析函数
+PARSERS = {
+    'news': fetch_news.parse_news,
+    'weibo': fetch_hotsearch.parse_weibo,
+}
+
+def save_fixtures(pages=5):
+    """抓取当前页面保存为样本"""
+    import http_client
+
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    targets = [(f'news_{p}.html', fetch_news.page_url(p)) for p in range(1, pages + 1)]
+    targets.append(('weibo_1.html', fetch_hotsearch.WEIBO_URL))
+    for name, url in targets:
+        resp = http_client.get(url, timeout=30)
+        if resp.status_code != 200:
+            print(f"❌ {name}: HTTP {resp.status_code}，未保存")
+            continue
+        resp.encoding = 'utf-8'
+        (FIXTURE_DIR / name).write_text(resp.text, encoding='utf-8')
+        print(f"已保存 {name} ({len(resp.text):,} 字符)")
+
+def synthetic_fixtures(items):
+    """生成结构与目标站点一致的合成页面"""
+    news_rows = ''.join(
+        f'<li><p class="title"><a href="https://finance.eastmoney.com/a/2026{i:08d}.html">'
+        f'<span>热点扫描第{i}条</span>新闻标题示例</a></p>'
+        f'<p class="info"><span class="time">02月19日 08:{i % 60:02d}</span></p></li>'
+        for i in range(items)
+    )
+    news = (
+        '<html><head><meta charset="utf-8"><title>热点扫描</title></head><body>'
+        + '<div class="nav"><a href="/">首页</a></div>' * 50
+        + f'<div class="mainCont"><div class="newslist"><ul>{news_rows}</ul></div></div>'
+        + '<div class="footer">' + '<p>页脚内容</p>' * 100 + '</div></body></html>'
+    )
+    weibo_rows = ''.join(
+        f'<tr><td class="td-01 ranktop">{i}</td>'
+        f'<td class="td-02"><a href="/weibo?q=%23{i}%23">微博热搜话题{i}</a><span>{100000 + i}</span></td>'
+        f'<td class="td-03"><span class="icon-wrap"><i>热</i></span></td></tr>'
+        for i in range(1, items + 1)
+    )
+    weibo = (
+        '<html><head><meta charset="utf-8"></head><body>'
+        f'<div id="pl_top_realtimehot"><table class="tab-list"><tbody>{weibo_rows}</tbody></table></div>'
+        '</body></html>'
+    )
+    return [('news_synthetic.html', news), ('weibo_synthetic.html', weibo)]
+
+def load_fixtures():
+    return [(p.name, p.read_text(encoding='utf-8')) for p in sorted(FIXTURE_DIR.glob('*.html'))]
+
+def bench(parse, html, backend, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = parse(html, backend=backend)
+    return (time.perf_counter() - start) / repeat, result
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML 解析后端基准测试')
+    parser.add_argument('--save', action='store_true', help='抓取当前页面保存为样本')
+    parser.add_argument('--synthetic', type=int, metavar='N', help='使用每页 N 条的合成页面')
+    parser.add_argument('--repeat', type=int, default=20, help='每个样本重复次数（默认 20）')
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures()
+        return 0
+
+    if not lxml_parsers.HAVE_LXML:
+        print("❌ lxml 未安装，无法对比")
+        return 1
+
+    if args.synthetic:
+        fixtures = synthetic_fixtures(args.synthetic)
+        print(f"⚠️  使用合成页面（每页 {args.synthetic} 条），结果不代表真实页面")
+    else:
+        fixtures = load_fixtures()
+        if not fixtures:
+            print(f"❌ 没有样本: {FIXTURE_DIR}")
+            print("   先运行 python3 bench_parsers.py --save 抓取真实页面；--synthetic N 只用于冒烟测试")
+            return 1
+
+    print("=" * 80)
+    print(f"{'样本':<24}{'条目':>6}{'bs4 (ms)':>12}{'lxml (ms)':>12}{'加速':>8}  结果一致")
+    print("=" * 80)
+
+    total_bs4 = total_lxml = 0.0
+    for name, html in fixtures:
+        parse = PARSERS.get(name.split('_', 1)[0])
+        if parse is None:
+            continue
+        t_bs4, r_bs4 = bench(parse, html, 'bs4', args.repeat)
+        t_lxml, r_lxml = bench(parse, html, 'lxml', args.repeat)
+        total_bs4 += t_bs4
+        total_lxml += t_lxml
+        same = '✅' if r_bs4 == r_lxml else '❌'
+        print(f"{name:<24}{len(r_lxml):>6}{t_bs4 * 1000:>12.2f}{t_lxml * 1000:>12.2f}"
+              f"{t_bs4 / t_lxml:>7.1f}x  {same}")
+
+    print("=" * 80)
+    if total_lxml:
+        print(f"合计: bs4 {total_bs4 * 1000:.2f} ms, lxml {total_lxml * 1000:.2f} ms, "
+              f"加速 {total_bs4 / total_lxml:.1f}x")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+纯 Python 的音频拼接
+MP3 按帧拼接：去掉各段的 ID3 标签和 Xing/Info 信息帧，把音频帧依次写入输出文件，
+句间停顿用预先生成的静音帧填充，最后在开头写一个新的 Info 帧记录总帧数；
+pyttsx3 生成的 WAV（文件名虽为 .mp3）按 PCM 数据拼接。
+不需要 concat 列表文件，也不启动 ffmpeg 进程
+
+用法:
+  python3 audio_concat.py audio/jingzhe_full.mp3 audio/jingzhe_sentence_*.mp3 --gap 0.3
+"""
+
+import argparse
+import sys
+import time
+import wave
+from functools import lru_cache
+from pathlib import Path
+
+from mp3_frames import find_first_frame, id3v2_size, info_tag, iter_frames, parse_header, side_info_size
+
+def _frame_template(data, pos):
+    """由源文件的帧头得到模板帧头：去掉 CRC 保护位和填充位"""
+    b0, b1, b2, b3 = data[pos:pos + 4]
+    return bytes((b0, b1 | 0x01, b2 & ~0x02 & 0xFF, b3))
+
+@lru_cache(maxsize=16)
+def silent_frame(template):
+    """
+    与模板参数相同的静音帧：side info 全为 0（main_data_begin 与各颗粒数据长度都为 0），
+    解码得到一帧静音，且不引用比特池中的数据
+    """
+    header = parse_header(template)
+    return template + bytes(header.length - 4)
+
+def _info_frame(template, frames, total_bytes, vbr):
+    """开头的 Xing/Info 帧，让播放器和 mp3_frames 不必逐帧扫描即可得到总时长"""
+    header = parse_header(template)
+    body = (b'Xing' if vbr else b'Info') + (0x03).to_bytes(4, 'big') \
+        + frames.to_bytes(4, 'big') + (total_bytes + header.length).to_bytes(4, 'big')
+    side_info = bytes(side_info_size(header))
+    if 4 + len(side_info) + len(body) > header.length:
+        return None
+    frame = template + side_info + body
+    return frame + bytes(header.length - len(frame))
+
+def _mp3_runs(data):
+    """
+    一个 MP3 文件中的音频帧：返回 (首帧偏移, 首帧帧头, 连续区间 [[起始, 结束]], 帧数, 比特率集合)
+    开头的 Xing/Info/VBRI 信息帧不计入
+    """
+    first_pos, first = find_first_frame(data, id3v2_size(data))
+    if first is None:
+        return None, None, [], 0, set()
+    runs = []
+    frames = 0
+    bitrates = set()
+    for pos, header in iter_frames(data, first_pos):
+        if pos == first_pos and header.layer == 3 and info_tag(data, pos, header):
+            continue
+        frames += 1
+        bitrates.add(header.bitrate)
+        if runs and runs[-1][1] == pos:
+            runs[-1][1] = pos + header.length
+        else:
+            runs.append([pos, pos + header.length])
+    return first_pos, first, runs, frames, bitrates
+
+def concat_mp3(inputs, output_file, gap=0.0):
+    """
+    按帧拼接 MP3，gap 为句间停顿（秒）
+    各段的版本、层、采样率、声道数必须一致（比特率可以不同），否则抛出 ValueError；返回总帧数和时长
+    """
+    output_file = Path(output_file)
+    sources = []
+    template = None
+    params = None
+    bitrates = set()
+
+    for path in inputs:
+        data = Path(path).read_bytes()
+        first_pos, first, runs, frames, rates = _mp3_runs(data)
+        if not frames:
+            raise ValueError(f"{Path(path).name} 中没有 MP3 音频帧")
+        key = (first.version, first.layer, first.sample_rate, first.channels)
+        if params is None:
+            params = key
+            template = _frame_template(data, first_pos)
+        elif key != params:
+            raise ValueError(f"{Path(path).name} 的格式 {key} 与第一段 {params} 不一致")
+        bitrates |= rates
+        sources.append((data, runs, frames))
+
+    header = parse_header(template)
+    silence = silent_frame(template)
+    gap_frames = round(gap * header.sample_rate / header.samples) if gap > 0 else 0
+
+    total_frames = sum(frames for *_, frames in sources) + gap_frames * (len(sources) - 1)
+    total_bytes = sum(end - start for _, runs, _ in sources for start, end in runs) \
+        + len(silence) * gap_frames * (len(sources) - 1)
+    info_frame = _info_frame(template, total_frames, total_bytes, vbr=len(bitrates) > 1)
+
+    tmp = output_file.with_suffix(output_file.suffix + '.tmp')
+    with open(tmp, 'wb') as f:
+        if info_frame:
+            f.write(info_frame)
+        for i, (data, runs, _) in enumerate(sources):
+            if i and gap_frames:
+                f.write(silence * gap_frames)
+            view = memoryview(data)
+            for start, end in runs:
+                f.write(view[start:end])
+    tmp.replace(output_file)
+    return {'frames': total_frames, 'duration': total_frames * header.samples / header.sample_rate}
+
+def concat_wav(inputs, output_file, gap=0.0):
+    """拼接 PCM WAV，各段的声道数、位深、采样率必须一致，否则抛出 ValueError"""
+    output_file = Path(output_file)
+    params = None
+    tmp = output_file.with_suffix(output_file.suffix + '.tmp')
+    with wave.open(str(tmp), 'wb') as out:
+        for i, path in enumerate(inputs):
+            try:
+                with wave.open(str(path), 'rb') as src:
+                    key = (src.getnchannels(), src.getsampwidth(), src.getframerate())
+                    if params is None:
+                        params = key
+                        out.setnchannels(key[0])
+                        out.setsampwidth(key[1])
+                        out.setframerate(key[2])
+                    elif key != params:
+                        raise ValueError(f"{Path(path).name} 的格式 {key} 与第一段 {params} 不一致")
+                    if i and gap > 0:
+                        out.writeframes(bytes(round(gap * key[2]) * key[0] * key[1]))
+                    out.writeframes(src.readframes(src.getnframes()))
+            except wave.Error as e:
+                raise ValueError(f"{Path(path).name}: {e}")
+    tmp.replace(output_file)
+    with wave.open(str(output_file), 'rb') as result:
+        frames = result.getnframes()
+        return {'frames': frames, 'duration': frames / result.getframerate()}
+
+def concat_audio(inputs, output_file, gap=0.0):
+    """
+    拼接音频（按文件内容识别 MP3 / WAV），成功返回输出文件路径，失败返回 None
+    """
+    inputs = [Path(p) for p in inputs]
+    output_file = Path(output_file)
+    print(f"\n拼接 {len(inputs)} 段音频 -> {output_file.name}" + (f"（句间停顿 {gap}秒）" if gap else ""))
+    if not inputs:
+        print("  ❌ 没有输入文件")
+        return None
+
+    start = time.perf_counter()
+    try:
+        with open(inputs[0], 'rb') as f:
+            magic = f.read(4)
+        if magic == b'RIFF':
+            result = concat_wav(inputs, output_file, gap)
+        else:
+            result = concat_mp3(inputs, output_file, gap)
+    except (OSError, ValueError) as e:
+        output_file.with_suffix(output_file.suffix + '.tmp').unlink(missing_ok=True)
+        print(f"  ❌ 拼接失败: {e}")
+        return None
+
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  ✅ {result['duration']:.3f}秒，{result['frames']} 帧，"
+          f"{output_file.stat().st_size:,} 字节，耗时 {elapsed:.1f}毫秒")
+    return output_file
+
+def main():
+    parser = argparse.ArgumentParser(description='纯 Python 拼接 MP3/WAV 音频')
+    parser.add_argument('output', help='输出文件')
+    parser.add_argument('inputs', nargs='+', help='按顺序拼接的音频文件')
+    parser.add_argument('--gap', type=float, default=0.0, help='句间停顿（秒）')
+    args = parser.parse_args()
+    return 0 if concat_audio(args.inputs, args.output, args.gap) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
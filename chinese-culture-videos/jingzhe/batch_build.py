@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+节气视频批量构建
+读取目录下的所有清单（每个节气一个 *.json，格式同 manifest.json），把各视频的构建节点放进
+同一个依赖图，用一个全局任务队列并行执行：字幕和片段渲染等 CPU 节点受 --jobs 限制，
+配音节点受 --tts-jobs 限制并共用同一个令牌桶；字体、配音缓存、媒体探测缓存都在进程内共享
+
+完成的视频记录在 output/build/batch_journal.json，崩溃或中断后重新运行会跳过已完成的视频，
+未完成视频中已构建的节点也不会重做；最后打印各阶段吞吐量
+
+用法:
+  python3 batch_build.py manifests/ --jobs 4
+  python3 batch_build.py manifests/ --force      # 忽略日志和增量状态，全部重建
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from build_graph import BuildGraph
+from build_video import build_graph, load_manifest
+from media_probe import get_duration, save_cache
+from render_cache import cache_key
+from segment_scheduler import default_workers
+from tts_scheduler import DEFAULT_CONCURRENCY
+
+STAGES = ('tts', 'probe', 'subtitle', 'segment', 'concat')
+
+def load_manifests(directory):
+    """按文件名顺序读取目录下的清单，无效或重名的清单跳过"""
+    manifests = []
+    names = set()
+    for path in sorted(Path(directory).glob("*.json")):
+        try:
+            manifest = load_manifest(path)
+        except (OSError, ValueError) as e:
+            print(f"  ❌ 清单无效 {path.name}: {e}")
+            continue
+        if manifest['name'] in names:
+            print(f"  ❌ 清单重名 {path.name}: {manifest['name']}")
+            continue
+        names.add(manifest['name'])
+        manifest['manifest_file'] = path
+        manifests.append(manifest)
+    return manifests
+
+def video_fingerprint(manifest):
+    """清单内容 + 所有图片和录音文件内容；文件缺失时返回 None"""
+    files = [manifest['manifest_file']]
+    for segment in manifest['segments']:
+        files.append(segment['image'])
+        if segment.get('audio'):
+            files.append(segment['audio'])
+    try:
+        return cache_key('video', [Path(f) for f in files])
+    except OSError:
+        return None
+
+def load_journal(path):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+def save_journal(path, journal):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(journal, indent=1, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp, path)
+
+def is_finished(manifest, journal):
+    """日志中有记录、输入没变且成片还在"""
+    entry = journal.get(manifest['name'])
+    return bool(entry) and manifest['output']['file'].exists() \
+        and entry.get('fingerprint') == video_fingerprint(manifest)
+
+def print_summary(graph, wall):
+    """各阶段节点数、累计耗时和吞吐量"""
+    stats = {stage: {'built': 0, 'fresh': 0, 'failed': 0, 'skipped': 0, 'busy': 0.0}
+             for stage in STAGES}
+    audio_seconds = 0.0
+    for name, (status, elapsed) in graph.results.items():
+        stage = name.rsplit('/', 1)[-1].split('_')[0]
+        if stage not in stats:
+            continue
+        stats[stage][status] += 1
+        stats[stage]['busy'] += elapsed
+        if stage == 'tts' and status == 'built':
+            audio_seconds += get_duration(graph.nodes[name].outputs[0])
+
+    minutes = wall / 60 if wall else 0
+    print("\n各阶段吞吐量:")
+    print(f"  {'阶段':<10}{'构建':>6}{'最新':>6}{'失败':>6}{'跳过':>6}{'累计耗时':>12}{'每分钟':>10}")
+    for stage, s in stats.items():
+        rate = s['built'] / minutes if minutes else 0.0
+        print(f"  {stage:<10}{s['built']:>6}{s['fresh']:>6}{s['failed']:>6}{s['skipped']:>6}"
+              f"{s['busy']:>10.1f}秒{rate:>10.1f}")
+    if minutes:
+        print(f"  片段渲染: {stats['segment']['built'] / minutes:.1f} 段/分钟")
+        print(f"  配音合成: {audio_seconds / minutes:.1f} 秒音频/分钟（共 {audio_seconds:.1f}秒，含配音缓存命中）")
+    print(f"  总耗时: {wall:.2f}秒")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按目录中的清单批量构建节气视频')
+    parser.add_argument('directory', help='清单目录（每个视频一个 *.json）')
+    parser.add_argument('--jobs', '-j', type=int, default=default_workers(),
+                        help='同时运行的 CPU 节点数（默认 CPU 核数的一半，x264 本身是多线程的）')
+    parser.add_argument('--tts-jobs', type=int, default=DEFAULT_CONCURRENCY, help='同时合成的配音数')
+    parser.add_argument('--force', action='store_true', help='忽略日志和增量状态，全部重建')
+    args = parser.parse_args(argv)
+
+    directory = Path(args.directory)
+    build_root = directory / "output" / "build"
+    journal_file = build_root / "batch_journal.json"
+
+    print("=" * 60)
+    print(f"批量构建: {directory}")
+    print("=" * 60)
+
+    manifests = load_manifests(directory)
+    if not manifests:
+        print("❌ 没有可用的清单")
+        return 1
+
+    journal = {} if args.force else load_journal(journal_file)
+    pending = []
+    for manifest in manifests:
+        if is_finished(manifest, journal):
+            print(f"  ♻️  已完成，跳过: {manifest['name']}")
+        else:
+            pending.append(manifest)
+            # 输入变了的视频要重新构建，先去掉旧记录
+            journal.pop(manifest['name'], None)
+    print(f"共 {len(manifests)} 个视频，待构建 {len(pending)} 个")
+    if not pending:
+        return 0
+
+    graph = BuildGraph(build_root / "batch_state.json")
+    by_concat = {}
+    for manifest in pending:
+        prefix = f"{manifest['name']}/"
+        build_graph(manifest, graph, prefix)
+        by_concat[f"{prefix}concat"] = manifest
+
+    def on_done(name, status):
+        # 每个视频一完成就写日志，之后崩溃也不会重做
+        manifest = by_concat.get(name)
+        if manifest is None:
+            return
+        if status in ('built', 'fresh'):
+            journal[manifest['name']] = {
+                'fingerprint': video_fingerprint(manifest),
+                'output': str(manifest['output']['file']),
+                'finished': time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            save_journal(journal_file, journal)
+            print(f"  🎬 {manifest['name']} 完成: {manifest['output']['file']}")
+        else:
+            print(f"  ❌ {manifest['name']} 未完成")
+
+    jobs = max(1, args.jobs)
+    ok = graph.run(jobs=jobs + max(1, args.tts_jobs), force=args.force,
+                   limits={'cpu': jobs, 'tts': max(1, args.tts_jobs)}, on_done=on_done, report=False)
+    save_cache()
+    print_summary(graph, graph.wall)
+
+    failed = [m['name'] for m in pending if m['name'] not in journal]
+    print(f"\n完成 {len(manifests) - len(failed)}/{len(manifests)} 个视频")
+    if failed:
+        print(f"❌ 未完成: {', '.join(failed)}（重新运行会从中断处继续）")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+增量构建依赖图
+每个节点声明输入文件、输出文件、依赖节点和参数；节点的指纹由参数和所有输入文件内容计算，
+输出都存在且指纹与上次成功构建时相同的节点直接跳过（只运行过期节点），
+依赖都完成的节点在线程池中并行执行，最后打印每个节点的耗时
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from render_cache import cache_key
+from segment_scheduler import default_workers
+
+class Node:
+    """
+    构建节点：action(node) 返回真值表示成功
+    pool 为资源类别（如 'cpu'），run() 可按类别限制同时运行的节点数
+    """
+
+    def __init__(self, name, action, inputs=(), outputs=(), deps=(), params=None, pool=None):
+        self.name = name
+        self.action = action
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.deps = list(deps)
+        self.params = params
+        self.pool = pool
+
+class BuildGraph:
+    """节点按添加顺序保存；state_file 记录每个节点上次成功构建时的指纹"""
+
+    def __init__(self, state_file):
+        self.state_file = Path(state_file)
+        self.nodes = {}
+        self.results = {}
+        self.wall = 0.0
+        self._lock = threading.Lock()
+        try:
+            self.state = json.loads(self.state_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.state = {}
+
+    def add(self, node):
+        if node.name in self.nodes:
+            raise ValueError(f"重复的节点: {node.name}")
+        self.nodes[node.name] = node
+        return node
+
+    def topological_order(self):
+        """按依赖排序，发现未知依赖或循环依赖时抛出 ValueError"""
+        for node in self.nodes.values():
+            for dep in node.deps:
+                if dep not in self.nodes:
+                    raise ValueError(f"节点 {node.name} 依赖不存在的节点 {dep}")
+
+        remaining = {name: set(node.deps) for name, node in self.nodes.items()}
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError("存在循环依赖: " + ", ".join(remaining))
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def _fingerprint(self, node):
+        """参数 + 输入文件内容（含依赖节点的输出）"""
+        inputs = list(node.inputs)
+        for dep in node.deps:
+            inputs += self.nodes[dep].outputs
+        return cache_key('node', node.name, node.params, inputs)
+
+    def _save_state(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(self.state, indent=1, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.state_file)
+
+    def _run_node(self, node, force):
+        """返回 (状态, 耗时)；状态为 built / fresh / failed"""
+        start = time.perf_counter()
+        try:
+            key = self._fingerprint(node)
+        except OSError as e:
+            print(f"  ❌ {node.name}: 缺少输入文件 ({e})")
+            return 'failed', 0.0
+
+        if not force and self.state.get(node.name) == key and all(p.exists() for p in node.outputs):
+            return 'fresh', time.perf_counter() - start
+
+        for path in node.outputs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            ok = node.action(node)
+        except Exception as e:
+            print(f"  ❌ {node.name}: {e}")
+            ok = False
+        elapsed = time.perf_counter() - start
+
+        if not ok or not all(p.exists() for p in node.outputs):
+            return 'failed', elapsed
+
+        with self._lock:
+            self.state[node.name] = key
+            self._save_state()
+        return 'built', elapsed
+
+    def run(self, jobs=None, force=False, limits=None, on_done=None, report=True):
+        """
+        执行构建：依赖都成功的节点并行运行，依赖失败的节点跳过
+        jobs 默认取 segment_scheduler.default_workers()（CPU 核数的一半，x264 本身是多线程的）
+        limits: {资源类别: 最大同时运行数}；on_done(name, status) 在每个节点结束时调用
+        返回是否全部成功；各节点的 (状态, 耗时) 保存在 self.results
+        """
+        order = self.topological_order()
+        jobs = max(1, jobs or default_workers())
+        limits = limits or {}
+        waiting = {name: set(self.nodes[name].deps) for name in order}
+        dependents = {name: [] for name in order}
+        for name in order:
+            for dep in self.nodes[name].deps:
+                dependents[dep].append(name)
+
+        results = self.results = {}
+        wall_start = time.perf_counter()
+        print(f"\n构建 {len(order)} 个节点（{jobs} 个并行）...")
+
+        def finish(name, status, elapsed):
+            results[name] = (status, elapsed)
+            if on_done:
+                on_done(name, status)
+            for child in dependents[name]:
+                if status in ('failed', 'skipped'):
+                    if child not in results:
+                        finish(child, 'skipped', 0.0)
+                else:
+                    waiting[child].discard(name)
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            running = {}
+            while True:
+                for name in order:
+                    if name in results or name in running.values() or waiting[name]:
+                        continue
+                    pool = self.nodes[name].pool
+                    if pool in limits and sum(1 for n in running.values()
+                                              if self.nodes[n].pool == pool) >= limits[pool]:
+                        continue
+                    running[executor.submit(self._run_node, self.nodes[name], force)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    status, elapsed = future.result()
+                    if status == 'built':
+                        print(f"  ✅ {name}: {elapsed:.2f}秒")
+                    finish(name, status, elapsed)
+
+        wall = self.wall = time.perf_counter() - wall_start
+        if report:
+            self.print_report(order, results, wall)
+        return all(results[name][0] in ('built', 'fresh') for name in order)
+
+    @staticmethod
+    def print_report(order, results, wall):
+        labels = {'built': '构建', 'fresh': '最新', 'failed': '失败', 'skipped': '跳过'}
+        print("\n节点耗时:")
+        for name in order:
+            status, elapsed = results[name]
+            print(f"  {labels[status]:<4} {name:<20} {elapsed:8.2f}秒")
+        counts = {label: sum(1 for s, _ in results.values() if s == status)
+                  for status, label in labels.items()}
+        busy = sum(elapsed for _, elapsed in results.values())
+        print("  " + "，".join(f"{label} {n}" for label, n in counts.items() if n)
+              + f"；总耗时 {wall:.2f}秒（节点累计 {busy:.2f}秒）")
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+按清单（manifest.json）构建节气短视频
+清单描述文案、每段图片、配音声音、字幕样式和输出规格，构建过程是一个依赖图：
+  tts_N（配音）→ probe_N（时长）→ subtitle_N（字幕图片）→ segment_N（片段）→ concat（成片）
+只运行过期的节点，互不依赖的节点并行执行；新的节气视频只需要新写一个清单
+
+用法:
+  python3 build_video.py                       # 使用同目录下的 manifest.json
+  python3 build_video.py path/to/manifest.json --jobs 4
+  python3 build_video.py --force               # 忽略增量状态，全部重建
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from build_graph import BuildGraph, Node
+from encoder_settings import load_settings
+from filtergraph_renderer import build_command
+from generate_audio_edge_tts import run_edge_tts_script
+from media_probe import get_duration
+from segment_scheduler import default_workers
+from subtitle_text import render_subtitle, resolve_font
+import tts_cache
+from tts_scheduler import DEFAULT_CONCURRENCY, shared_bucket
+
+# 项目路径
+PROJECT_DIR = Path(__file__).parent
+DEFAULT_MANIFEST = PROJECT_DIR / "manifest.json"
+
+DEFAULT_VOICE = {"name": "zh-CN-XiaoxiaoNeural", "rate": "default", "pitch": "default"}
+DEFAULT_SUBTITLE = {
+    "size": [1080, 200],
+    "position_y": 1240,
+    "font_size": 40,
+    "max_line_width": None,
+    "line_height": None,
+    "background": [0, 0, 0, 180],
+}
+DEFAULT_OUTPUT = {"width": 1080, "height": 1440, "fps": 25}
+
+def load_manifest(path):
+    """读取清单，补全默认值，相对路径按清单所在目录解析"""
+    path = Path(path)
+    manifest = json.loads(path.read_text(encoding='utf-8'))
+    base = path.parent
+
+    manifest['voice'] = {**DEFAULT_VOICE, **manifest.get('voice', {})}
+    manifest['subtitle'] = {**DEFAULT_SUBTITLE, **manifest.get('subtitle', {})}
+    manifest['output'] = {**DEFAULT_OUTPUT, **manifest.get('output', {})}
+    name = manifest.setdefault('name', path.stem)
+    manifest['output']['file'] = base / manifest['output'].get('file', f"output/{name}.mp4")
+    manifest['build_dir'] = base / manifest.get('build_dir', f"output/build/{name}")
+
+    if not manifest.get('segments'):
+        raise ValueError(f"清单 {path} 中没有 segments")
+    for i, segment in enumerate(manifest['segments'], 1):
+        if not segment.get('text') or not segment.get('image'):
+            raise ValueError(f"第 {i} 段缺少 text 或 image")
+        segment['image'] = base / segment['image']
+        if segment.get('audio'):
+            segment['audio'] = base / segment['audio']
+    return manifest
+
+def _tts_action(text, voice):
+    def synth(text, output_file):
+        # 各 tts 节点并行执行，共用同一个令牌桶限速（命中配音缓存时不占用令牌）
+        shared_bucket().acquire()
+        return run_edge_tts_script(text, output_file, voice['name'], voice['rate'], voice['pitch'])
+
+    def action(node):
+        return tts_cache.cached_synthesize(text, node.outputs[0], synth, 'edge-tts', voice['name'],
+                                           rate=voice['rate'], pitch=voice['pitch'])
+    return action
+
+def _probe_action(audio):
+    def action(node):
+        duration = get_duration(audio)
+        if not duration:
+            print(f"  ❌ 无法获取音频时长: {audio}")
+            return False
+        node.outputs[0].write_text(json.dumps({'duration': duration}), encoding='utf-8')
+        return True
+    return action
+
+def _subtitle_action(text, style, font_path):
+    def action(node):
+        image = render_subtitle(
+            text,
+            size=tuple(style['size']),
+            font_size=style['font_size'],
+            max_line_width=style['max_line_width'],
+            line_height=style['line_height'],
+            background=tuple(style['background']),
+            font_path=font_path,
+        )
+        image.save(node.outputs[0], 'PNG')
+        return True
+    return action
+
+def _segment_action(image, subtitle, audio, probe_file, output, subtitle_y):
+    def action(node):
+        duration = json.loads(probe_file.read_text(encoding='utf-8'))['duration']
+        cmd = build_command([(image, subtitle, audio, duration)], node.outputs[0],
+                            fps=output['fps'], width=output['width'], height=output['height'],
+                            subtitle_y=subtitle_y)
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"  ❌ {node.name}: {result.stderr[-300:]}")
+        return result.returncode == 0
+    return action
+
+def _concat_action(segment_files, list_file):
+    def action(node):
+        with open(list_file, 'w') as f:
+            for segment in segment_files:
+                f.write(f"file '{segment.absolute()}'\n")
+        cmd = [
+            "ffmpeg", "-y",
+            "-f", "concat", "-safe", "0",
+            "-i", str(list_file),
+            "-c", "copy",
+            str(node.outputs[0])
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"  ❌ {node.name}: {result.stderr[-300:]}")
+        return result.returncode == 0
+    return action
+
+def build_graph(manifest, graph=None, prefix=''):
+    """
+    把清单展开成依赖图
+    传入 graph 时把节点加入已有的图（批量构建），节点名加上 prefix 以区分不同视频；
+    配音节点属于 'tts' 资源类别，字幕、片段渲染和拼接节点属于 'cpu' 资源类别
+    """
+    build_dir = manifest['build_dir']
+    voice = manifest['voice']
+    style = manifest['subtitle']
+    output = manifest['output']
+    font_path = resolve_font()
+    font_inputs = [font_path] if font_path else []
+
+    if graph is None:
+        graph = BuildGraph(build_dir / "build_state.json")
+    segment_files = []
+
+    for i, segment in enumerate(manifest['segments'], 1):
+        text = segment['text']
+
+        # 清单里直接给出录音时不需要合成
+        audio = segment.get('audio')
+        audio_deps = []
+        if not audio:
+            audio = build_dir / f"audio_{i}.mp3"
+            graph.add(Node(f"{prefix}tts_{i}", _tts_action(text, voice),
+                           outputs=[audio], params=('tts', text, voice), pool='tts'))
+            audio_deps = [f"{prefix}tts_{i}"]
+
+        probe_file = build_dir / f"probe_{i}.json"
+        graph.add(Node(f"{prefix}probe_{i}", _probe_action(audio),
+                       inputs=[audio], outputs=[probe_file], deps=audio_deps))
+
+        subtitle_file = build_dir / f"subtitle_{i}.png"
+        graph.add(Node(f"{prefix}subtitle_{i}", _subtitle_action(text, style, font_path),
+                       inputs=font_inputs, outputs=[subtitle_file],
+                       params=('subtitle', text, style, font_path), pool='cpu'))
+
+        segment_file = build_dir / f"segment_{i}.mp4"
+        graph.add(Node(f"{prefix}segment_{i}",
+                       _segment_action(segment['image'], subtitle_file, audio, probe_file,
+                                       output, style['position_y']),
+                       inputs=[segment['image'], audio], outputs=[segment_file],
+                       deps=[f"{prefix}probe_{i}", f"{prefix}subtitle_{i}"],
+                       params=('segment', output, style['position_y'], load_settings()), pool='cpu'))
+        segment_files.append(segment_file)
+
+    graph.add(Node(f"{prefix}concat", _concat_action(segment_files, build_dir / "concat.txt"),
+                   outputs=[output['file']],
+                   deps=[f"{prefix}segment_{i}" for i in range(1, len(segment_files) + 1)],
+                   params=('concat', len(segment_files)), pool='cpu'))
+    return graph
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按清单构建节气短视频')
+    parser.add_argument('manifest', nargs='?', default=str(DEFAULT_MANIFEST), help='清单文件路径')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='同时运行的字幕/片段渲染节点数（默认 CPU 核数的一半，x264 本身是多线程的）')
+    parser.add_argument('--force', action='store_true', help='忽略增量状态，全部重建')
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(args.manifest)
+    print("=" * 60)
+    print(f"构建视频: {manifest.get('title', manifest['name'])}（{len(manifest['segments'])} 段）")
+    print("=" * 60)
+
+    graph = build_graph(manifest)
+    # 配音节点主要在等网络，单独限制，不占用渲染的并行名额
+    jobs = max(1, args.jobs or default_workers())
+    if not graph.run(jobs=jobs + DEFAULT_CONCURRENCY, force=args.force,
+                     limits={'cpu': jobs, 'tts': DEFAULT_CONCURRENCY}):
+        print("\n❌ 构建失败")
+        return 1
+
+    final = manifest['output']['file']
+    print(f"\n✅ 构建完成: {final}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
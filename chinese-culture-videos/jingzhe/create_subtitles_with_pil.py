@@ -5,85 +5,47 @@
 """
 
 from PIL import Image, ImageDraw, ImageFont
-import textwrap
-import os
 from pathlib import Path
 
+from render_cache import cached_build
+from subtitle_text import render_subtitle, resolve_font
+
 # 项目路径
 PROJECT_DIR = Path(__file__).parent
 OUTPUT_DIR = PROJECT_DIR / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 def find_font():
-    """查找可用的中文字体"""
-    font_paths = [
-        # 系统字体路径
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-        "/usr/share/fonts/truetype/ubuntu/Ubuntu-R.ttf",
-        "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",  # Google Noto字体
-        "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
-    ]
-    
-    for font_path in font_paths:
-        if os.path.exists(font_path):
-            print(f"找到字体: {font_path}")
-            return font_path
-    
-    print("警告: 未找到系统字体，使用默认字体")
-    return None
+    """查找可用的中文字体（结果在进程内缓存，只探测一次）"""
+    return resolve_font()
+
+# 字幕图片尺寸
+SUBTITLE_SIZE = (1080, 200)
 
 def create_subtitle_with_pil(text, output_path, font_size=40):
-    """使用PIL创建字幕图片"""
+    """使用PIL创建字幕图片（文字、字体、字号、尺寸都没变时复用缓存）"""
     print(f"创建字幕图片: {text[:20]}...")
     
-    # 图片尺寸
-    width, height = 1080, 200
+    font_path = find_font()
+    key_parts = ['pil-subtitle', text, font_size, SUBTITLE_SIZE, font_path]
+    if font_path:
+        key_parts.append(Path(font_path))
+    
+    def build(out):
+        return render_subtitle_with_pil(text, out, font_size, font_path)
     
+    return cached_build(output_path, key_parts, build) is not None
+
+def draw_subtitle_with_pil(text, font_size=40, font_path=None):
+    """在内存中绘制字幕图片，返回 RGBA 的 PIL Image（不写文件）"""
+    # 黑色半透明背景，每行最多约15个汉字宽
+    return render_subtitle(text, SUBTITLE_SIZE, font_size, max_line_width=15 * font_size,
+                           background=(0, 0, 0, 180), font_path=font_path)
+
+def render_subtitle_with_pil(text, output_path, font_size, font_path):
+    """绘制字幕图片并保存为PNG"""
     try:
-        # 创建图片
-        image = Image.new('RGBA', (width, height), (0, 0, 0, 180))  # 黑色半透明背景
-        draw = ImageDraw.Draw(image)
-        
-        # 加载字体
-        font_path = find_font()
-        if font_path:
-            try:
-                font = ImageFont.truetype(font_path, font_size)
-                print(f"  使用字体: {os.path.basename(font_path)}")
-            except:
-                print(f"  警告: 无法加载字体 {font_path}，使用默认字体")
-                font = ImageFont.load_default()
-        else:
-            font = ImageFont.load_default()
-            print("  使用默认字体")
-        
-        # 文本换行（每行最多15个字符）
-        wrapped_text = textwrap.fill(text, width=15)
-        lines = wrapped_text.split('\n')
-        
-        # 计算文本位置
-        line_height = font_size + 10
-        total_height = len(lines) * line_height
-        y_start = (height - total_height) // 2
-        
-        # 绘制每行文本
-        for i, line in enumerate(lines):
-            # 计算文本宽度
-            if hasattr(font, 'getbbox'):
-                bbox = font.getbbox(line)
-                text_width = bbox[2] - bbox[0]
-            else:
-                # 估算宽度
-                text_width = len(line) * (font_size // 2)
-            
-            x = (width - text_width) // 2
-            y = y_start + i * line_height
-            
-            # 绘制文本阴影（提高可读性）
-            draw.text((x+2, y+2), line, font=font, fill=(0, 0, 0, 255))
-            # 绘制文本
-            draw.text((x, y), line, font=font, fill=(255, 255, 255, 255))
+        image = draw_subtitle_with_pil(text, font_size, font_path)
         
         # 保存图片
         image.save(output_path, 'PNG')
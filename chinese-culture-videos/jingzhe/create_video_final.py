@@ -5,10 +5,14 @@
 """
 
 import os
+import shutil
 import subprocess
 from pathlib import Path
 import time
 
+from image_prep import image_files, prepare_images
+from media_probe import get_duration, probe
+
 # 项目路径
 PROJECT_DIR = Path(__file__).parent
 AUDIO_DIR = PROJECT_DIR / "audio"
@@ -21,8 +25,12 @@ def check_dependencies():
     print("检查依赖...")
     
     # 检查FFmpeg
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        print("❌ FFmpeg 未安装")
+        return False
     try:
-        result = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True)
+        result = subprocess.run([ffmpeg, "-version"], capture_output=True, text=True)
         if result.returncode == 0:
             print("✅ FFmpeg 已安装")
             # 提取版本信息
@@ -47,10 +55,8 @@ def check_dependencies():
         print(f"✅ 音频文件: {audio_file.name} ({size:,} 字节)")
         
         # 获取音频时长
-        cmd = f"ffprobe -v error -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 {audio_file}"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
-            duration = float(result.stdout.strip())
+        duration = get_duration(audio_file)
+        if duration:
             print(f"   时长: {duration:.2f} 秒")
     else:
         print(f"❌ 音频文件不存在: {audio_file}")
@@ -79,53 +85,13 @@ def check_dependencies():
     
     return True
 
-def resize_images():
-    """调整图片尺寸为小红书竖屏比例 3:4 (1080x1440)"""
+def resize_images(mode='cover'):
+    """调整图片尺寸为小红书竖屏比例 3:4 (1080x1440)，按比例裁剪不变形，多进程并行"""
     print("\n调整图片尺寸...")
     
-    image_files = list(IMAGE_DIR.glob("*"))
     resized_dir = IMAGE_DIR / "resized"
-    resized_dir.mkdir(exist_ok=True)
-    
-    resized_files = []
-    
-    for img_file in image_files:
-        if img_file.is_dir():
-            continue
-            
-        output_file = resized_dir / f"resized_{img_file.name}"
-        
-        # 确定输出格式
-        if img_file.suffix.lower() in ['.jpg', '.jpeg']:
-            output_file = output_file.with_suffix('.jpg')
-        elif img_file.suffix.lower() == '.png':
-            output_file = output_file.with_suffix('.png')
-        elif img_file.suffix.lower() == '.webp':
-            output_file = output_file.with_suffix('.jpg')  # 转换为JPG
-        
-        print(f"调整: {img_file.name} -> {output_file.name}")
-        
-        # FFmpeg调整尺寸命令
-        # 使用缩放和裁剪来保持3:4比例
-        cmd = [
-            "ffmpeg", "-i", str(img_file),
-            "-vf", "scale=1080:1440:force_original_aspect_ratio=disable,pad=1080:1440:(ow-iw)/2:(oh-ih)/2",
-            "-y",  # 覆盖输出文件
-            str(output_file)
-        ]
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                size = output_file.stat().st_size
-                print(f"  成功: {size:,} 字节")
-                resized_files.append(output_file)
-            else:
-                print(f"  失败: {result.stderr[:100]}")
-        except Exception as e:
-            print(f"  错误: {e}")
-    
-    return resized_files
+    results = prepare_images(image_files(IMAGE_DIR), resized_dir, mode=mode)
+    return [f for f in results if f]
 
 def create_simple_video(images, audio, output_file, duration=15):
     """创建简单视频（图片幻灯片）"""
@@ -205,13 +171,10 @@ def create_simple_video(images, audio, output_file, duration=15):
                 print(f"   文件大小: {size:,} 字节")
                 
                 # 获取视频信息
-                info_cmd = f"ffprobe -v error -select_streams v:0 -show_entries stream=width,height,duration -of csv=p=0 {output_file}"
-                info_result = subprocess.run(info_cmd, shell=True, capture_output=True, text=True)
-                if info_result.returncode == 0:
-                    info = info_result.stdout.strip().split(',')
-                    if len(info) >= 3:
-                        print(f"   分辨率: {info[0]}x{info[1]}")
-                        print(f"   时长: {float(info[2]):.2f} 秒")
+                info = probe(output_file)
+                if info and 'width' in info:
+                    print(f"   分辨率: {info['width']}x{info['height']}")
+                    print(f"   时长: {info.get('duration') or 0:.2f} 秒")
             
             return True
         else:
@@ -8,6 +8,10 @@ import subprocess
 import os
 from pathlib import Path
 
+from media_probe import get_duration
+from render_cache import cached_command
+from segment_scheduler import render_segments
+
 # 项目路径
 PROJECT_DIR = Path(__file__).parent
 AUDIO_DIR = PROJECT_DIR / "audio"
@@ -15,17 +19,6 @@ IMAGE_DIR = PROJECT_DIR / "images"
 OUTPUT_DIR = PROJECT_DIR / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-def get_duration(file_path):
-    """获取媒体文件时长"""
-    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", 
-           "-of", "default=noprint_wrappers=1:nokey=1", str(file_path)]
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return float(result.stdout.strip())
-    except:
-        return 0.0
-
 def create_segment(audio_file, image_file, subtitle_text, segment_num):
     """创建单个视频片段"""
     print(f"\n创建片段 {segment_num}: {subtitle_text[:20]}...")
@@ -42,38 +35,33 @@ def create_segment(audio_file, image_file, subtitle_text, segment_num):
     
     # 创建带硬编码字幕的视频片段
     # 使用简单的drawtext，每个片段只有一个字幕
-    cmd = [
-        "ffmpeg", "-y",
-        "-loop", "1",
-        "-i", str(image_file),
-        "-i", str(audio_file),
-        "-vf", f"scale=1080:1440:force_original_aspect_ratio=disable,"
-               f"pad=1080:1440:(ow-iw)/2:(oh-ih)/2:color=black,"
-               f"drawtext=text='{subtitle_text}':"
-               f"fontsize=48:fontcolor=white:"
-               f"box=1:boxcolor=black@0.7:boxborderw=10:"
-               f"x=(w-text_w)/2:y=h-150",
-        "-c:v", "libx264",
-        "-t", str(audio_duration),
-        "-pix_fmt", "yuv420p",
-        "-c:a", "aac",
-        "-shortest",
-        str(segment_file)
-    ]
+    def make_cmd(out):
+        return [
+            "ffmpeg", "-y",
+            "-loop", "1",
+            "-i", str(image_file),
+            "-i", str(audio_file),
+            "-vf", f"scale=1080:1440:force_original_aspect_ratio=disable,"
+                   f"pad=1080:1440:(ow-iw)/2:(oh-ih)/2:color=black,"
+                   f"drawtext=text='{subtitle_text}':"
+                   f"fontsize=48:fontcolor=white:"
+                   f"box=1:boxcolor=black@0.7:boxborderw=10:"
+                   f"x=(w-text_w)/2:y=h-150",
+            "-c:v", "libx264",
+            "-t", str(audio_duration),
+            "-pix_fmt", "yuv420p",
+            "-c:a", "aac",
+            "-shortest",
+            str(out)
+        ]
     
-    try:
-        print(f"  执行FFmpeg命令...")
-        subprocess.run(cmd, capture_output=True, check=True)
-        
-        if segment_file.exists() and segment_file.stat().st_size > 0:
-            print(f"  ✅ 片段创建成功: {segment_file.name}")
-            return segment_file
-        else:
-            print(f"  ❌ 片段文件未创建或为空")
-            return None
-            
-    except subprocess.CalledProcessError as e:
-        print(f"  ❌ FFmpeg失败: {e}")
+    # 图片、音频、字幕文字和参数都没变时直接复用缓存的片段
+    print(f"  执行FFmpeg命令...")
+    if cached_command(segment_file, make_cmd, inputs=[image_file, audio_file]):
+        print(f"  ✅ 片段创建成功: {segment_file.name}")
+        return segment_file
+    else:
+        print(f"  ❌ 片段创建失败")
         return None
 
 def merge_segments(segment_files, output_file):
@@ -164,20 +152,20 @@ def create_video_with_overlay():
     for i, img_file in enumerate(image_files[:5], 1):
         output_file = OUTPUT_DIR / f"seg_img_{i}.jpg"
         
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", str(img_file),
-            "-vf", "scale=1080:1440:force_original_aspect_ratio=disable,"
-                   "pad=1080:1440:(ow-iw)/2:(oh-ih)/2:color=black",
-            "-q:v", "2",
-            str(output_file)
-        ]
+        def make_cmd(out, img_file=img_file):
+            return [
+                "ffmpeg", "-y",
+                "-i", str(img_file),
+                "-vf", "scale=1080:1440:force_original_aspect_ratio=disable,"
+                       "pad=1080:1440:(ow-iw)/2:(oh-ih)/2:color=black",
+                "-q:v", "2",
+                str(out)
+            ]
         
-        try:
-            subprocess.run(cmd, capture_output=True, check=True)
+        if cached_command(output_file, make_cmd, inputs=[img_file]):
             resized_images.append(output_file)
             print(f"调整图片 {i}: {img_file.name}")
-        except:
+        else:
             print(f"调整图片失败 {img_file.name}")
     
     if len(resized_images) < 5:
@@ -193,20 +181,22 @@ def create_video_with_overlay():
         "惊蛰吃梨，寓意远离疾病，开启健康一年。"
     ]
     
-    # 创建5个独立的视频片段
-    segment_files = []
-    for i in range(5):
-        segment = create_segment(
+    # 并行创建5个独立的视频片段（结果保持片段顺序）
+    tasks = [
+        (i + 1, lambda i=i: create_segment(
             audio_file=audio_files[i],
             image_file=resized_images[i],
             subtitle_text=subtitles[i],
             segment_num=i+1
-        )
-        
+        ))
+        for i in range(5)
+    ]
+    segment_files = []
+    for i, segment in enumerate(render_segments(tasks), 1):
         if segment:
             segment_files.append(segment)
         else:
-            print(f"❌ 片段 {i+1} 创建失败")
+            print(f"❌ 片段 {i} 创建失败")
             return None
     
     if len(segment_files) != 5:
@@ -1,18 +1,52 @@
 #!/usr/bin/env python3
 """
 下载惊蛰相关图片
+多张图片并发下载，响应体分块流式写入 .part 文件，中断后用 Range 请求续传；
+下载完成后按文件头识别真实格式并用 PIL 校验能否解码（拦截 HTML 错误页等），
+同一主机的并发数和请求间隔单独限制，不再全局 sleep
 """
 
+import json
 import os
-import requests
-from pathlib import Path
+import re
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from PIL import Image
 
 # 项目路径
 PROJECT_DIR = Path(__file__).parent
 IMAGE_DIR = PROJECT_DIR / "images"
 IMAGE_DIR.mkdir(exist_ok=True)
 
+# 共享 HTTP 客户端位于仓库根目录
+sys.path.insert(0, str(PROJECT_DIR.parents[1]))
+import http_client
+
+# 分块不宜过大：连接中断时最后一个不完整的分块会丢失，续传从已写入的位置开始
+CHUNK_SIZE = 16 * 1024
+MAX_WORKERS = 4
+# 每个主机：最多同时下载 2 张，相邻两次请求至少间隔 0.5 秒
+HOST_CONCURRENCY = 2
+HOST_INTERVAL = 0.5
+
+# 文件头 -> (格式, 扩展名)
+IMAGE_SIGNATURES = [
+    (b'\xff\xd8\xff', 'JPEG', '.jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'PNG', '.png'),
+    (b'GIF87a', 'GIF', '.gif'),
+    (b'GIF89a', 'GIF', '.gif'),
+    (b'BM', 'BMP', '.bmp'),
+]
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
+
+CONTENT_RANGE_RE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+
 # 从tavily_search结果中获取的图片URL
 image_urls = [
     "https://photo.16pic.com/00/94/34/16pic_9434111_b.jpg",  # 惊蛰图片1
@@ -31,32 +65,167 @@ image_descriptions = [
     "jingzhe_farming"
 ]
 
-def download_image(url, filename, retry=3):
-    """下载图片"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
+def sniff_format(head):
+    """按文件头识别图片格式，返回 (格式, 扩展名)，不是图片时返回 (None, None)"""
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'WEBP', '.webp'
+    for magic, fmt, ext in IMAGE_SIGNATURES:
+        if head.startswith(magic):
+            return fmt, ext
+    return None, None
+
+class HostGate:
+    """按主机限制并发下载数和相邻请求的最小间隔"""
+
+    def __init__(self, concurrency=HOST_CONCURRENCY, interval=HOST_INTERVAL):
+        self.concurrency = concurrency
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    def slot(self, host):
+        """该主机的并发名额（用 with 获取）"""
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.concurrency)
+            return self._slots[host]
+
+    def wait_turn(self, host):
+        """预约该主机的下一个请求时刻并等待到那时"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.interval
+        time.sleep(start - now)
+
+_gate = HostGate()
+
+def _verify(path):
+    """按文件头识别格式并用 PIL 校验可解码，返回 (格式, 扩展名)，失败时抛出 ValueError"""
+    with open(path, 'rb') as f:
+        head = f.read(32)
+    fmt, ext = sniff_format(head)
+    if fmt is None:
+        preview = head[:16].decode('utf-8', 'replace').strip()
+        raise ValueError(f"不是图片（文件头: {preview!r}）")
+    try:
+        with Image.open(path) as img:
+            img.verify()
+    except Exception as e:
+        raise ValueError(f"{fmt} 数据损坏或不完整: {e}")
+    return fmt, ext
+
+def _stream_to_part(url, part_file, meta_file):
+    """
+    下载到 part_file：已有部分内容时带 Range/If-Range 续传，服务器不支持或资源已变化时从头下载
+    206 响应的 Content-Range 起点与本地已有字节数不一致时抛出 ValueError（丢弃 .part 后从头下载）
+    """
+    headers = {}
+    done = part_file.stat().st_size if part_file.exists() else 0
+    meta = {}
+    if done:
+        try:
+            meta = json.loads(meta_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            meta = {}
+        headers['Range'] = f"bytes={done}-"
+        if meta.get('validator'):
+            headers['If-Range'] = meta['validator']
+
+    host = urlsplit(url).hostname or ''
+    with _gate.slot(host):
+        _gate.wait_turn(host)
+        resp = http_client.get(url, headers=headers, timeout=10, stream=True)
+        with resp:
+            if resp.status_code == 416 and done:
+                # 已经下载完整
+                return done, done
+            resp.raise_for_status()
+
+            if resp.status_code == 206:
+                match = CONTENT_RANGE_RE.match(resp.headers.get('Content-Range', ''))
+                if not match or int(match.group(1)) != done:
+                    raise ValueError(f"续传范围不符（本地 {done:,} 字节，"
+                                     f"Content-Range: {resp.headers.get('Content-Range')}）")
+                mode = 'ab'
+                print(f"  续传: {part_file.stem} 从 {done:,} 字节开始")
+            else:
+                mode = 'wb'
+                done = 0
+            validator = resp.headers.get('ETag') or resp.headers.get('Last-Modified')
+            meta_file.write_text(json.dumps({'url': url, 'validator': validator}), encoding='utf-8')
+
+            total = resp.headers.get('Content-Length')
+            total = done + int(total) if total and total.isdigit() else None
+            with open(part_file, mode) as f:
+                for chunk in resp.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    done += len(chunk)
+    return done, total
+
+def find_existing(stem):
+    """images/ 下已存在且能通过校验的同名图片"""
+    for path in sorted(IMAGE_DIR.glob(f"{stem}.*")):
+        if path.suffix.lower() not in IMAGE_EXTENSIONS:
+            continue
+        try:
+            _verify(path)
+            return path
+        except (OSError, ValueError):
+            continue
+    return None
+
+def download_image(url, stem, retry=3, force=False):
+    """
+    下载一张图片，扩展名由实际格式决定；成功返回保存路径，失败返回 None
+    中途断开的下载保留 .part 文件，下次重试时续传
+    """
+    if not force:
+        existing = find_existing(stem)
+        if existing:
+            print(f"  ♻️  已存在: {existing.name}")
+            return existing
+
+    part_file = IMAGE_DIR / f"{stem}.part"
+    meta_file = IMAGE_DIR / f"{stem}.part.meta"
+    if force:
+        part_file.unlink(missing_ok=True)
+    start = time.perf_counter()
+
     for attempt in range(retry):
         try:
-            print(f"下载: {filename} (尝试 {attempt + 1}/{retry})")
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # 保存图片
-            with open(filename, 'wb') as f:
-                f.write(response.content)
-            
-            file_size = os.path.getsize(filename)
-            print(f"  成功: {filename} ({file_size} 字节)")
-            return True
-            
-        except Exception as e:
-            print(f"  错误: {e}")
-            if attempt < retry - 1:
-                time.sleep(1)
-    
-    return False
+            done, total = _stream_to_part(url, part_file, meta_file)
+            if total is not None and done < total:
+                raise requests.ConnectionError(f"连接中断（{done:,}/{total:,} 字节）")
+            fmt, ext = _verify(part_file)
+        except (requests.RequestException, OSError) as e:
+            # 网络错误：保留已下载部分，下次续传
+            print(f"  错误: {stem} (尝试 {attempt + 1}/{retry}): {e}")
+            continue
+        except ValueError as e:
+            # 内容不是完整的图片，或服务器返回的续传范围不符：丢弃后从头下载
+            print(f"  错误: {stem} (尝试 {attempt + 1}/{retry}): {e}")
+            part_file.unlink(missing_ok=True)
+            meta_file.unlink(missing_ok=True)
+            continue
+
+        filename = IMAGE_DIR / f"{stem}{ext}"
+        os.replace(part_file, filename)
+        meta_file.unlink(missing_ok=True)
+        elapsed = time.perf_counter() - start
+        print(f"  ✅ {filename.name}: {fmt}，{filename.stat().st_size:,} 字节，{elapsed:.2f}秒")
+        return filename
+
+    print(f"  ❌ 下载失败: {stem}")
+    return None
+
+def download_all(urls, stems, workers=MAX_WORKERS, force=False):
+    """并发下载，返回与 urls 顺序一致的保存路径列表（失败为 None）"""
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as executor:
+        futures = [executor.submit(download_image, url, stem, force=force)
+                   for url, stem in zip(urls, stems)]
+        return [f.result() for f in futures]
 
 def main():
     """主函数"""
@@ -64,27 +233,14 @@ def main():
     print("下载惊蛰节气图片素材")
     print("=" * 50)
     
-    successful_downloads = 0
-    
-    for i, (url, desc) in enumerate(zip(image_urls, image_descriptions), 1):
-        # 确定文件扩展名
-        if '.webp' in url.lower():
-            ext = '.webp'
-        elif '.png' in url.lower():
-            ext = '.png'
-        else:
-            ext = '.jpg'
-        
-        filename = IMAGE_DIR / f"{desc}{ext}"
-        
-        if download_image(url, filename):
-            successful_downloads += 1
-        
-        # 避免请求过快
-        time.sleep(1)
+    force = '--force' in sys.argv[1:]
+    start = time.perf_counter()
+    results = download_all(image_urls, image_descriptions, force=force)
+    successful_downloads = sum(1 for r in results if r)
     
     print("\n" + "=" * 50)
-    print(f"下载完成: {successful_downloads}/{len(image_urls)} 张图片")
+    print(f"下载完成: {successful_downloads}/{len(image_urls)} 张图片，耗时 {time.perf_counter() - start:.2f}秒")
+    http_client.print_stats()
     print("=" * 50)
     
     # 列出下载的图片
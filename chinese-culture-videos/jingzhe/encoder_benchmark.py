@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+编码参数基准测试
+用参考清单（默认 manifest.json）按一组编码参数组合分别渲染：preset、-tune stillimage、
+关键帧间隔、输出帧率，以及静止画面低帧率输入（如 1 帧/秒）再复制到输出帧率。
+每次渲染记录墙钟时间、子进程 CPU 时间（不受机器核数影响，便于在不同机器间比较）、
+文件大小和相对高质量参考渲染的 SSIM，求出 (CPU 时间, 大小, SSIM) 的 Pareto 前沿，
+从中选出满足最低画质要求且 CPU 时间最少的组合，写入 encoder_settings.json 作为渲染默认参数
+
+用法:
+  python3 encoder_benchmark.py
+  python3 encoder_benchmark.py --presets veryfast,medium --input-fps 0,1 --min-ssim 0.97
+  python3 encoder_benchmark.py --dry-run          # 只列出参数组合
+"""
+
+import argparse
+import itertools
+import json
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+from build_video import DEFAULT_MANIFEST, load_manifest
+from encoder_settings import DEFAULTS, save_settings
+from filtergraph_renderer import build_command
+from media_probe import get_duration
+from subtitle_text import render_subtitle, resolve_font
+
+# 项目路径
+PROJECT_DIR = Path(__file__).parent
+OUTPUT_DIR = PROJECT_DIR / "output"
+RESULTS_FILE = OUTPUT_DIR / "encoder_benchmark.json"
+
+# 高质量参考渲染，用于计算 SSIM
+REFERENCE = {**DEFAULTS, "preset": "medium", "crf": 12}
+
+SSIM_RE = re.compile(r"SSIM .*All:([\d.]+)")
+
+def _csv(value, cast=str):
+    return [cast(v) for v in value.split(',') if v != '']
+
+def _optional(cast):
+    """'0' 或 'none' 表示不设置该参数"""
+    def parse(v):
+        return None if v.lower() in ('0', 'none', '') else cast(v)
+    return parse
+
+def settings_matrix(presets, tunes, gops, fps_values, input_fps_values, crf):
+    """所有参数组合（低帧率输入不低于输出帧率的组合去掉）"""
+    matrix = []
+    for preset, tune, gop, fps, input_fps in itertools.product(
+            presets, tunes, gops, fps_values, input_fps_values):
+        if input_fps and input_fps >= fps:
+            continue
+        matrix.append({"preset": preset, "crf": crf, "tune": tune, "gop_seconds": gop,
+                       "fps": fps, "input_fps": input_fps})
+    return matrix
+
+def label(settings):
+    parts = [settings['preset'], f"crf{settings['crf']}"]
+    if settings['tune']:
+        parts.append(settings['tune'])
+    parts.append(f"g{settings['gop_seconds']:g}s" if settings['gop_seconds'] else "g默认")
+    parts.append(f"{settings['fps']}fps")
+    if settings['input_fps']:
+        parts.append(f"in{settings['input_fps']}")
+    return "/".join(parts)
+
+def _silent_wav(path, seconds, rate=22050):
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(bytes(int(seconds * rate) * 2))
+    return path
+
+def prepare_segments(manifest, work_dir, segment_duration):
+    """
+    参考时间线：清单的图片 + 预先渲染的字幕图片 + 音频
+    音频优先用清单里的录音或之前 build_video.py 生成的配音，都没有时用静音（编码测试只关心画面）
+    """
+    style = manifest['subtitle']
+    font_path = resolve_font()
+    segments = []
+    for i, segment in enumerate(manifest['segments'], 1):
+        subtitle = work_dir / f"subtitle_{i}.png"
+        render_subtitle(segment['text'], size=tuple(style['size']), font_size=style['font_size'],
+                        max_line_width=style['max_line_width'], line_height=style['line_height'],
+                        background=tuple(style['background']), font_path=font_path).save(subtitle)
+
+        audio = segment.get('audio') or manifest['build_dir'] / f"audio_{i}.mp3"
+        duration = get_duration(audio) if Path(audio).exists() else 0.0
+        if not duration:
+            duration = segment_duration
+            audio = _silent_wav(work_dir / f"silence_{i}.wav", duration)
+        segments.append((segment['image'], subtitle, audio, duration))
+    return segments
+
+def render(segments, output_file, settings, output):
+    """渲染一次，返回 (墙钟秒, CPU 秒) 或 None"""
+    cmd = build_command(segments, output_file, fps=settings['fps'], width=output['width'],
+                        height=output['height'], subtitle_y=output['subtitle_y'], settings=settings)
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    if result.returncode != 0 or not Path(output_file).exists():
+        print(f"  ❌ 渲染失败: {result.stderr[-300:]}")
+        return None
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    return wall, cpu
+
+def ssim(candidate, reference, fps):
+    """两段视频统一到同一帧率后计算平均 SSIM"""
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostdin",
+        "-i", str(candidate), "-i", str(reference),
+        "-lavfi", f"[0:v]fps={fps},settb=AVTB[a];[1:v]fps={fps},settb=AVTB[b];[a][b]ssim",
+        "-f", "null", "-",
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    match = SSIM_RE.search(result.stderr)
+    return float(match.group(1)) if match else None
+
+def pareto_front(results):
+    """CPU 时间越少越好、文件越小越好、SSIM 越高越好；返回不被其他结果支配的结果"""
+    def dominates(a, b):
+        no_worse = a['cpu'] <= b['cpu'] and a['size'] <= b['size'] and a['ssim'] >= b['ssim']
+        better = a['cpu'] < b['cpu'] or a['size'] < b['size'] or a['ssim'] > b['ssim']
+        return no_worse and better
+
+    return [r for r in results if not any(dominates(o, r) for o in results if o is not r)]
+
+def choose_default(front, min_ssim):
+    """Pareto 前沿中 SSIM 达标的组合里 CPU 时间最少的（相同时取文件更小的）"""
+    candidates = [r for r in front if r['ssim'] >= min_ssim] or \
+        sorted(front, key=lambda r: -r['ssim'])[:1]
+    return min(candidates, key=lambda r: (r['cpu'], r['size'])) if candidates else None
+
+def print_table(results, front):
+    print(f"\n{'参数':<40}{'墙钟':>8}{'CPU':>8}{'大小':>12}{'SSIM':>9}")
+    for r in sorted(results, key=lambda r: r['cpu']):
+        mark = " ★" if r in front else ""
+        print(f"{r['label']:<40}{r['wall']:>7.2f}秒{r['cpu']:>7.2f}秒"
+              f"{r['size'] / 1024:>10.0f}KB{r['ssim']:>9.4f}{mark}")
+    print("★ = Pareto 前沿")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='编码参数基准测试，结果写入 encoder_settings.json')
+    parser.add_argument('manifest', nargs='?', default=str(DEFAULT_MANIFEST), help='参考清单')
+    parser.add_argument('--presets', type=_csv, default=['ultrafast', 'veryfast', 'fast', 'medium'])
+    parser.add_argument('--tunes', type=lambda v: _csv(v, _optional(str)), default=[None, 'stillimage'],
+                        help='none 表示不设置 -tune')
+    parser.add_argument('--gops', type=lambda v: _csv(v, _optional(float)), default=[None, 10.0],
+                        help='关键帧间隔（秒），0 表示 x264 默认')
+    parser.add_argument('--fps', type=lambda v: _csv(v, int), default=[25])
+    parser.add_argument('--input-fps', type=lambda v: _csv(v, _optional(int)), default=[None, 1],
+                        help='静止画面输入帧率，0 表示与输出帧率相同')
+    parser.add_argument('--crf', type=int, default=23)
+    parser.add_argument('--min-ssim', type=float, default=0.98, help='选择默认参数时的最低 SSIM')
+    parser.add_argument('--segment-duration', type=float, default=4.0,
+                        help='没有配音时每段的时长（秒）')
+    parser.add_argument('--dry-run', action='store_true', help='只列出参数组合')
+    parser.add_argument('--no-write', action='store_true', help='不写入 encoder_settings.json')
+    args = parser.parse_args(argv)
+
+    matrix = settings_matrix(args.presets, args.tunes, args.gops, args.fps, args.input_fps, args.crf)
+    print(f"参数组合: {len(matrix)} 个")
+    if args.dry_run:
+        for settings in matrix:
+            print(f"  {label(settings)}")
+        return 0
+    if not shutil.which("ffmpeg"):
+        print("❌ 未找到 ffmpeg")
+        return 1
+
+    manifest = load_manifest(args.manifest)
+    output = {**manifest['output'], 'subtitle_y': manifest['subtitle']['position_y']}
+    OUTPUT_DIR.mkdir(exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="encoder-bench-") as tmp:
+        work_dir = Path(tmp)
+        segments = prepare_segments(manifest, work_dir, args.segment_duration)
+        total = sum(duration for *_, duration in segments)
+        print(f"参考时间线: {len(segments)} 段，共 {total:.2f}秒")
+
+        reference = work_dir / "reference.mp4"
+        reference_settings = {**REFERENCE, 'fps': max(args.fps)}
+        print(f"\n渲染参考视频（{label(reference_settings)}）...")
+        if not render(segments, reference, reference_settings, output):
+            return 1
+
+        results = []
+        for n, settings in enumerate(matrix, 1):
+            candidate = work_dir / f"candidate_{n}.mp4"
+            print(f"[{n}/{len(matrix)}] {label(settings)}")
+            timing = render(segments, candidate, settings, output)
+            if not timing:
+                continue
+            score = ssim(candidate, reference, reference_settings['fps'])
+            if score is None:
+                print("  ❌ 无法计算 SSIM")
+                continue
+            wall, cpu = timing
+            results.append({'label': label(settings), 'settings': settings, 'wall': wall, 'cpu': cpu,
+                            'size': candidate.stat().st_size, 'ssim': score})
+            print(f"  墙钟 {wall:.2f}秒，CPU {cpu:.2f}秒，{candidate.stat().st_size / 1024:.0f}KB，SSIM {score:.4f}")
+            candidate.unlink()
+
+    if not results:
+        print("❌ 没有成功的渲染")
+        return 1
+
+    front = pareto_front(results)
+    print_table(results, front)
+    RESULTS_FILE.write_text(json.dumps({'manifest': str(args.manifest), 'duration': total,
+                                        'results': results,
+                                        'pareto': [r['label'] for r in front]},
+                                       indent=1, ensure_ascii=False), encoding='utf-8')
+    print(f"\n测量结果已保存: {RESULTS_FILE}")
+
+    best = choose_default(front, args.min_ssim)
+    print(f"选中默认参数: {best['label']}（CPU {best['cpu']:.2f}秒，SSIM {best['ssim']:.4f}）")
+    if not args.no_write:
+        path = save_settings(best['settings'], source={
+            'benchmark': best['label'], 'cpu': round(best['cpu'], 3), 'wall': round(best['wall'], 3),
+            'size': best['size'], 'ssim': best['ssim'], 'min_ssim': args.min_ssim,
+            'date': time.strftime('%Y-%m-%d'),
+        })
+        print(f"✅ 已写入: {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+视频编码参数
+渲染脚本统一从这里取 x264 参数；encoder_benchmark.py 跑完基准测试后把选中的参数写入
+encoder_settings.json，没有该文件时使用与原先相同的默认值（libx264 默认 preset、crf 23）
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent
+SETTINGS_FILE = PROJECT_DIR / "encoder_settings.json"
+
+DEFAULTS = {
+    "preset": "medium",
+    "crf": 23,
+    "tune": None,
+    # 关键帧间隔（秒），None 表示使用 x264 默认值
+    "gop_seconds": None,
+    "fps": 25,
+    # 静止画面的输入帧率，低于 fps 时先按低帧率处理画面，再复制帧到输出帧率；None 表示与 fps 相同
+    "input_fps": None,
+}
+
+@lru_cache(maxsize=None)
+def _load(path):
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('settings', {})
+
+def load_settings(path=SETTINGS_FILE):
+    """默认值 + encoder_settings.json 中的设置"""
+    return {**DEFAULTS, **{k: v for k, v in _load(str(path)).items() if k in DEFAULTS}}
+
+def save_settings(settings, source=None, path=SETTINGS_FILE):
+    """写入选中的参数，source 记录来源（如基准测试的测量结果）"""
+    data = {'settings': {k: settings.get(k, DEFAULTS[k]) for k in DEFAULTS}}
+    if source:
+        data['source'] = source
+    Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+    _load.cache_clear()
+    return path
+
+def encoder_args(settings=None, fps=None):
+    """ffmpeg 输出编码参数（视频 libx264 + 音频 aac）"""
+    settings = settings or load_settings()
+    fps = fps or settings['fps']
+    args = ["-c:v", "libx264", "-preset", settings['preset'], "-crf", str(settings['crf'])]
+    if settings['tune']:
+        args += ["-tune", settings['tune']]
+    if settings['gop_seconds']:
+        args += ["-g", str(max(1, round(settings['gop_seconds'] * fps)))]
+    return args + [
+        "-pix_fmt", "yuv420p",
+        "-c:a", "aac",
+        "-movflags", "+faststart",
+    ]
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+单次滤镜图渲染
+把整条时间线写成一个 ffmpeg filter_complex：每张图片缩放/补边到 1080x1440，
+叠加该句的字幕图片，再与对应音频一起 concat，一次编码直接输出最终视频。
+不再生成 bg_N.jpg / merged_N.jpg / segment_N.mp4 等中间文件，
+避免每一步 JPEG 重新编码带来的画质损失和磁盘往返
+"""
+
+import subprocess
+import time
+from pathlib import Path
+
+from encoder_settings import encoder_args, load_settings
+
+# 画面尺寸（小红书竖屏 3:4）和字幕位置（1440-200=1240）
+WIDTH, HEIGHT = 1080, 1440
+SUBTITLE_Y = 1240
+
+def build_command(segments, output_file, fps=None, width=WIDTH, height=HEIGHT,
+                  subtitle_y=SUBTITLE_Y, settings=None):
+    """
+    生成单次渲染的 ffmpeg 命令
+
+    segments: [(背景图片, 字幕图片或 None, 音频文件, 时长秒)]
+    每个片段的画面时长严格等于音频时长，音频不足时补静音
+    settings 为编码参数（默认读取 encoder_settings）；input_fps 低于 fps 时，
+    缩放和叠加字幕只按低帧率处理，再用 fps 滤镜复制帧并裁到准确时长
+    """
+    settings = settings or load_settings()
+    fps = fps or settings['fps']
+    input_fps = min(settings['input_fps'] or fps, fps)
+    resample = ""
+    inputs = []
+    filters = []
+    concat_inputs = []
+    index = 0
+
+    for n, (image, subtitle, audio, duration) in enumerate(segments):
+        duration = f"{duration:.3f}"
+        if input_fps != fps:
+            resample = f"fps={fps},trim=duration={duration},"
+
+        inputs += ["-loop", "1", "-framerate", str(input_fps), "-t", duration, "-i", str(image)]
+        image_idx = index
+        index += 1
+
+        filters.append(
+            f"[{image_idx}:v]scale={width}:{height}:force_original_aspect_ratio=disable,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:color=black,setsar=1[bg{n}]"
+        )
+
+        if subtitle:
+            inputs += ["-i", str(subtitle)]
+            filters.append(
+                f"[bg{n}][{index}:v]overlay=0:{subtitle_y},{resample}format=yuv420p,setpts=PTS-STARTPTS[v{n}]"
+            )
+            index += 1
+        else:
+            filters.append(f"[bg{n}]{resample}format=yuv420p,setpts=PTS-STARTPTS[v{n}]")
+
+        inputs += ["-i", str(audio)]
+        filters.append(
+            f"[{index}:a]aresample=44100,aformat=channel_layouts=stereo,"
+            f"apad,atrim=0:{duration},asetpts=PTS-STARTPTS[a{n}]"
+        )
+        index += 1
+
+        concat_inputs.append(f"[v{n}][a{n}]")
+
+    filters.append(f"{''.join(concat_inputs)}concat=n={len(segments)}:v=1:a=1[v][a]")
+
+    return [
+        "ffmpeg", "-y",
+        *inputs,
+        "-filter_complex", ";".join(filters),
+        "-map", "[v]", "-map", "[a]",
+        *encoder_args(settings, fps),
+        str(output_file),
+    ]
+
+def render_timeline(segments, output_file, fps=None):
+    """一次渲染整条时间线，成功返回输出文件路径，失败返回 None"""
+    output_file = Path(output_file)
+    total = sum(duration for *_, duration in segments)
+    print(f"\n单次渲染 {len(segments)} 个片段（共 {total:.2f}秒）-> {output_file.name}")
+
+    cmd = build_command(segments, output_file, fps)
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError:
+        print("  ❌ 未找到 ffmpeg")
+        return None
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0 or not output_file.exists():
+        print(f"  ❌ 渲染失败: {result.stderr[-300:]}")
+        return None
+
+    print(f"  ✅ 渲染完成: {elapsed:.2f}秒，{output_file.stat().st_size:,} 字节")
+    return output_file
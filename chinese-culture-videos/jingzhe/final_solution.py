@@ -7,22 +7,16 @@ import subprocess
 import os
 from pathlib import Path
 
+from filtergraph_renderer import render_timeline
+from media_probe import get_duration
+from render_cache import cached_command
+from segment_scheduler import render_segments
+
 # 项目路径
 PROJECT_DIR = Path(__file__).parent
 OUTPUT_DIR = PROJECT_DIR / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-def get_duration(file_path):
-    """获取媒体文件时长"""
-    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", 
-           "-of", "default=noprint_wrappers=1:nokey=1", str(file_path)]
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return float(result.stdout.strip())
-    except:
-        return 0.0
-
 def create_chinese_subtitle_final(text, output_path):
     """使用正确的中文字体创建字幕图片"""
     print(f"创建中文字幕: {text[:20]}...")
@@ -70,6 +64,67 @@ def create_chinese_subtitle_final(text, output_path):
         print(f"  ❌ 所有中文字体都失败")
         return False
 
+def create_segment(num, bg_file, subtitle_file, audio_file, duration):
+    """创建单个视频片段：调整背景 -> 叠加字幕 -> 编码"""
+    print(f"\n  创建片段 {num}...")
+    
+    # 每一步的输入和参数都没变时直接复用缓存，只重新渲染变化的片段
+    # 调整背景图片
+    resized_bg = OUTPUT_DIR / f"final_bg_{num}.jpg"
+    
+    def resize_cmd(out):
+        return [
+            "ffmpeg", "-y",
+            "-i", str(bg_file),
+            "-vf", "scale=1080:1440:force_original_aspect_ratio=disable,pad=1080:1440:(ow-iw)/2:(oh-ih)/2:color=black",
+            "-q:v", "2",
+            str(out)
+        ]
+    
+    if not cached_command(resized_bg, resize_cmd, inputs=[bg_file]):
+        print(f"  ❌ 片段 {num} 背景调整失败")
+        return None
+    
+    # 合并图片
+    merged_file = OUTPUT_DIR / f"final_merged_{num}.jpg"
+    
+    def overlay_cmd(out):
+        return [
+            "ffmpeg", "-y",
+            "-i", str(resized_bg),
+            "-i", str(subtitle_file),
+            "-filter_complex", "[0:v][1:v]overlay=0:1240",
+            str(out)
+        ]
+    
+    if not cached_command(merged_file, overlay_cmd, inputs=[resized_bg, subtitle_file]):
+        print(f"  ❌ 片段 {num} 字幕叠加失败")
+        return None
+    
+    # 创建视频片段
+    segment_file = OUTPUT_DIR / f"final_segment_{num}.mp4"
+    
+    def segment_cmd(out):
+        return [
+            "ffmpeg", "-y",
+            "-loop", "1",
+            "-i", str(merged_file),
+            "-i", str(audio_file),
+            "-c:v", "libx264",
+            "-t", str(duration),
+            "-pix_fmt", "yuv420p",
+            "-c:a", "aac",
+            "-shortest",
+            str(out)
+        ]
+    
+    if cached_command(segment_file, segment_cmd, inputs=[merged_file, audio_file]):
+        print(f"  ✅ 片段 {num} 创建成功")
+        return segment_file
+    else:
+        print(f"  ❌ 片段 {num} 创建失败")
+        return None
+
 def create_final_video_solution():
     """创建最终解决方案视频"""
     print("=" * 60)
@@ -123,74 +178,33 @@ def create_final_video_solution():
         print(f"错误: 需要5张图片，只找到 {len(image_files)} 张")
         return None
     
-    # 4. 创建视频片段
-    print("\n4. 创建视频片段...")
-    segment_files = []
+    final_video = OUTPUT_DIR / "jingzhe_final_solution.mp4"
     
-    for i in range(5):
-        print(f"\n  创建片段 {i+1}...")
-        
-        # 调整背景图片
-        bg_file = image_files[i]
-        resized_bg = OUTPUT_DIR / f"final_bg_{i+1}.jpg"
-        
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", str(bg_file),
-            "-vf", "scale=1080:1440:force_original_aspect_ratio=disable,pad=1080:1440:(ow-iw)/2:(oh-ih)/2:color=black",
-            "-q:v", "2",
-            str(resized_bg)
-        ]
-        
-        subprocess.run(cmd, capture_output=True)
-        
-        # 合并图片
-        merged_file = OUTPUT_DIR / f"final_merged_{i+1}.jpg"
-        
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", str(resized_bg),
-            "-i", str(subtitle_files[i]),
-            "-filter_complex", "[0:v][1:v]overlay=0:1240",
-            str(merged_file)
-        ]
-        
-        subprocess.run(cmd, capture_output=True)
-        
-        # 创建视频片段
-        segment_file = OUTPUT_DIR / f"final_segment_{i+1}.mp4"
-        
-        cmd = [
-            "ffmpeg", "-y",
-            "-loop", "1",
-            "-i", str(merged_file),
-            "-i", str(audio_files[i]),
-            "-c:v", "libx264",
-            "-t", str(audio_durations[i]),
-            "-pix_fmt", "yuv420p",
-            "-c:a", "aac",
-            "-shortest",
-            str(segment_file)
-        ]
-        
-        subprocess.run(cmd, capture_output=True)
-        
-        if segment_file.exists():
-            segment_files.append(segment_file)
-            print(f"  ✅ 片段 {i+1} 创建成功")
-        else:
-            print(f"  ❌ 片段 {i+1} 创建失败")
-            return None
+    # 4. 单次渲染：整条时间线一个滤镜图，一次编码直接输出最终视频
+    print("\n4. 单次渲染完整视频...")
+    segments = list(zip(image_files[:5], subtitle_files, audio_files, audio_durations))
+    if render_timeline(segments, final_video):
+        return report_final_video(final_video)
     
-    # 5. 合并视频片段
-    print(f"\n5. 合并视频片段...")
+    # 单次渲染失败时退回分段渲染 + 合并
+    print("\n  单次渲染失败，改用分段渲染...")
+    tasks = [
+        (i + 1, lambda i=i: create_segment(
+            i + 1, image_files[i], subtitle_files[i], audio_files[i], audio_durations[i]
+        ))
+        for i in range(5)
+    ]
+    segment_files = render_segments(tasks)
+    if not all(segment_files):
+        return None
+    
+    # 合并视频片段
+    print(f"\n  合并视频片段...")
     concat_file = OUTPUT_DIR / "final_concat.txt"
     with open(concat_file, 'w') as f:
         for segment in segment_files:
             f.write(f"file '{segment.absolute()}'\n")
     
-    final_video = OUTPUT_DIR / "jingzhe_final_solution.mp4"
-    
     cmd = [
         "ffmpeg", "-y",
         "-f", "concat",
@@ -202,6 +216,10 @@ def create_final_video_solution():
     
     subprocess.run(cmd, capture_output=True)
     
+    return report_final_video(final_video)
+
+def report_final_video(final_video):
+    """打印最终视频信息"""
     if final_video.exists():
         duration = get_duration(final_video)
         size = final_video.stat().st_size
@@ -241,7 +259,7 @@ def main():
         print(f"   1. ✅ 使用正确的中文字体 (Noto-Sans-CJK-SC)")
         print(f"   2. ✅ ImageMagick创建字幕图片")
         print(f"   3. ✅ 白色背景 + 黑色文字，高对比度")
-        print(f"   4. ✅ 分段创建 + 合并，时间准确")
+        print(f"   4. ✅ 单次滤镜图渲染，只编码一次，时间准确")
         print(f"   5. ✅ 彻底解决字幕显示问题")
         
         print(f"\n🔗 GitHub链接:")
@@ -8,8 +8,9 @@
 import subprocess
 import os
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
-import textwrap
+from PIL import Image, ImageDraw
+
+from subtitle_text import get_font, layout_subtitle
 
 # 项目路径
 PROJECT_DIR = Path(__file__).parent
@@ -30,54 +31,24 @@ def create_proper_subtitle(text, output_path, font_size=44):
         
         # 加载中文字体
         font_path = '/usr/share/fonts/opentype/noto/NotoSerifCJK-Bold.ttc'
-        if os.path.exists(font_path):
-            font = ImageFont.truetype(font_path, font_size, index=0)
-            print(f"  使用字体: NotoSerifCJK-Bold.ttc")
-        else:
+        if not os.path.exists(font_path):
             print(f"  ❌ 中文字体未找到")
             return False
+        print(f"  使用字体: NotoSerifCJK-Bold.ttc")
         
-        # 智能文本换行 - 避免单个字单独一行
-        # 计算每行最佳字符数
-        chars_per_line = 12  # 每行12个字符比较合适
-        
-        # 如果文本中有标点，适当调整
-        if '，' in text or '。' in text:
-            # 按标点自然分割
-            parts = []
-            current = ""
-            for char in text:
-                current += char
-                if char in '，。、；：':
-                    parts.append(current)
-                    current = ""
-            if current:
-                parts.append(current)
-            
-            # 合并过短的部分
-            merged_parts = []
-            temp = ""
-            for part in parts:
-                if len(temp) + len(part) <= chars_per_line:
-                    temp += part
-                else:
-                    if temp:
-                        merged_parts.append(temp)
-                    temp = part
-            if temp:
-                merged_parts.append(temp)
-            
-            lines = merged_parts
-        else:
-            # 没有标点，按字符数分割
-            lines = textwrap.wrap(text, width=chars_per_line)
+        # 按像素宽度排版：每行不超过约12个汉字宽，遵守避头尾规则（标点不出现在行首），
+        # 放不下时自动缩小字号
+        layout = layout_subtitle(text, font_path, font_size, 12 * font_size, height - 40,
+                                 (font_size + 10) / font_size)
+        font = get_font(font_path, layout.font_size)
+        lines = layout.lines
         
         print(f"  排版: {len(lines)}行")
         for i, line in enumerate(lines):
             print(f"    行{i+1}: {line}")
         
         # 计算文本位置
-        line_height = font_size + 10
+        line_height = layout.line_height
         total_height = len(lines) * line_height
         y_start = (height - total_height) // 2
         
@@ -9,6 +9,10 @@
 import subprocess
 from pathlib import Path
 
+from media_probe import get_duration
+from subtitle_timeline import (EDGE_TTS_CLIPS, audio_duration, build_timeline, matches_track,
+                               sentence_audio_files, write_subtitles)
+
 # 项目路径
 PROJECT_DIR = Path(__file__).parent
 AUDIO_DIR = PROJECT_DIR / "audio"
@@ -19,40 +23,17 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 def get_audio_duration():
     """获取音频时长"""
     audio_file = AUDIO_DIR / "jingzhe_full_new.mp3"
-    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", 
-           "-of", "default=noprint_wrappers=1:nokey=1", str(audio_file)]
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        duration = float(result.stdout.strip())
+    duration = get_duration(audio_file)
+    if duration:
         print(f"音频时长: {duration:.2f}秒")
         return duration
-    except Exception as e:
-        print(f"获取音频时长失败: {e}")
-        return 23.0  # 默认值
+    print(f"获取音频时长失败: {audio_file.name}")
+    return 23.0  # 默认值
 
 def create_fixed_subtitles():
-    """创建修复的字幕文件（使用通用字体）"""
+    """创建修复的字幕文件（使用通用字体），时间轴取自每句配音的实际时长"""
     print("\n创建修复的字幕文件...")
     
-    # 使用更通用的字体
-    ass_content = """[Script Info]
-ScriptType: v4.00+
-Collisions: Normal
-PlayDepth: 0
-
-[V4+ Styles]
-Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-Style: Default,Arial,40,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,30,1
-
-[Events]
-Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
-"""
-    
-    # 根据音频时长调整时间轴
-    audio_duration = get_audio_duration()
-    
-    # 计算每句的时间
     sentences = [
         "惊蛰，是二十四节气中的第三个节气。",
         "春雷始鸣，惊醒蛰伏于地下越冬的昆虫。",
@@ -61,41 +42,27 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         "惊蛰吃梨，寓意远离疾病，开启健康一年。"
     ]
     
-    # 每句大约4-5秒
-    time_per_sentence = audio_duration / len(sentences)
+    # 视频用的 jingzhe_full_new.mp3 由 edge-tts 的 jingzhe_N.mp3 拼接而成，
+    # 读取这些逐句配音的时长（解析文件头，不启动 ffprobe），累加得到时间轴
+    files = sentence_audio_files(len(sentences), patterns=(EDGE_TTS_CLIPS,))
+    durations = [audio_duration(f) for f in files]
+    audio_duration_total = get_audio_duration()
+    if matches_track(durations, audio_duration_total):
+        print("逐句音频时长: " + ", ".join(f"{d:.2f}秒" for d in durations))
+    else:
+        # 逐句音频缺失，或与实际音轨对不上（例如音轨由另一组配音拼成）时按总时长平均分配
+        print(f"⚠️  逐句音频合计 {sum(durations):.2f}秒，与音轨时长 {audio_duration_total:.2f}秒 不一致，"
+              "按总时长平均分配")
+        durations = [audio_duration_total / len(sentences)] * len(sentences)
     
-    for i, sentence in enumerate(sentences):
-        start_time = i * time_per_sentence
-        end_time = (i + 1) * time_per_sentence
-        
-        # 转换为ASS时间格式: 0:00:00.00
-        start_str = f"{int(start_time//3600)}:{int((start_time%3600)//60):02d}:{start_time%60:05.2f}"
-        end_str = f"{int(end_time//3600)}:{int((end_time%3600)//60):02d}:{end_time%60:05.2f}"
-        
-        ass_content += f"Dialogue: 0,{start_str},{end_str},Default,,0,0,0,,{sentence}\n"
+    cues = build_timeline(sentences, durations)
     
+    # ASS 和 SRT 由同一个时间轴生成
     ass_file = OUTPUT_DIR / "jingzhe_subtitles_fixed.ass"
-    ass_file.write_text(ass_content, encoding='utf-8')
-    
-    print(f"修复的字幕文件已保存: {ass_file}")
-    
-    # 同时创建SRT版本
-    srt_content = ""
-    for i, sentence in enumerate(sentences, 1):
-        start_time = (i-1) * time_per_sentence
-        end_time = i * time_per_sentence
-        
-        # 转换为SRT时间格式: 00:00:00,000
-        start_str = f"{int(start_time//3600):02d}:{int((start_time%3600)//60):02d}:{start_time%60:06.3f}".replace('.', ',')
-        end_str = f"{int(end_time//3600):02d}:{int((end_time%3600)//60):02d}:{end_time%60:06.3f}".replace('.', ',')
-        
-        srt_content += f"{i}\n"
-        srt_content += f"{start_str} --> {end_str}\n"
-        srt_content += f"{sentence}\n\n"
-    
     srt_file = OUTPUT_DIR / "jingzhe_subtitles_fixed.srt"
-    srt_file.write_text(srt_content, encoding='utf-8')
+    write_subtitles(cues, ass_file, srt_file)
     
+    print(f"修复的字幕文件已保存: {ass_file}")
     print(f"修复的SRT字幕文件已保存: {srt_file}")
     
     return ass_file, srt_file
@@ -233,10 +200,7 @@ def add_subtitles_to_video(video_file, subtitle_file):
         subprocess.run(cmd, capture_output=True, check=True)
         
         # 验证视频时长
-        duration_cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", 
-                       "-of", "default=noprint_wrappers=1:nokey=1", str(output_file)]
-        result = subprocess.run(duration_cmd, capture_output=True, text=True, check=True)
-        final_duration = float(result.stdout.strip())
+        final_duration = get_duration(output_file)
         
         print(f"✅ 字幕添加成功: {output_file}")
         print(f"最终视频时长: {final_duration:.2f}秒")
@@ -374,18 +338,15 @@ def main():
         print(f"\n最终视频: {final_video}")
         
         # 检查时长
-        duration_cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", 
-                       "-of", "default=noprint_wrappers=1:nokey=1", str(final_video)]
-        try:
-            result = subprocess.run(duration_cmd, capture_output=True, text=True, check=True)
-            final_duration = float(result.stdout.strip())
+        final_duration = get_duration(final_video)
+        if final_duration:
             print(f"视频时长: {final_duration:.2f}秒")
             
             if final_duration < 20:
                 print("⚠️  警告: 视频时长可能仍然不足")
             else:
                 print("✅ 视频时长正常")
-        except:
+        else:
             print("无法获取视频时长")
         
         # 检查文件大小
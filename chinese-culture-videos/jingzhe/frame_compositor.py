@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+内存合成模式：用 PIL 完成背景缩放和字幕绘制，原始 RGB 帧通过 stdin 送进同一个 ffmpeg 进程
+不写字幕 PNG、不生成中间图片，也没有每个片段一次的 ffmpeg 启动开销；
+每个静止片段只合成一帧，按时长重复写入管道，音频在同一进程中拼接
+
+用法:
+  python3 frame_compositor.py
+"""
+
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from create_subtitles_with_pil import draw_subtitle_with_pil, find_font
+from encoder_settings import encoder_args, load_settings
+from filtergraph_renderer import HEIGHT, SUBTITLE_Y, WIDTH
+from image_prep import fit_image
+from media_probe import get_duration
+
+# 项目路径
+PROJECT_DIR = Path(__file__).parent
+AUDIO_DIR = PROJECT_DIR / "audio"
+IMAGE_DIR = PROJECT_DIR / "images"
+OUTPUT_DIR = PROJECT_DIR / "output"
+OUTPUT_DIR.mkdir(exist_ok=True)
+
+# 静止画面不需要高输入帧率：管道按低帧率送帧，输出再转成编码参数中的 fps；
+# encoder_settings 没有指定 input_fps 时按 IN_FPS 送帧
+IN_FPS = 10
+
+def compose_frame(image_path, subtitle_text=None, font_path=None, font_size=40):
+    """背景按比例铺满 1080x1440（居中裁剪，不拉伸），再按透明度叠加字幕"""
+    frame = fit_image(image_path, (WIDTH, HEIGHT), mode='cover')
+    if subtitle_text:
+        subtitle = draw_subtitle_with_pil(subtitle_text, font_size, font_path)
+        frame.paste(subtitle, (0, SUBTITLE_Y), subtitle)
+    return frame
+
+def frame_rates(in_fps=None, out_fps=None, settings=None):
+    """(管道输入帧率, 输出帧率)：默认取 encoder_settings 的 input_fps 和 fps，输入帧率不超过输出帧率"""
+    settings = settings or load_settings()
+    out_fps = out_fps or settings['fps']
+    in_fps = in_fps or settings['input_fps'] or IN_FPS
+    return min(in_fps, out_fps), out_fps
+
+def build_command(audio_files, output_file, in_fps=None, out_fps=None, settings=None):
+    """从 stdin 读原始帧、拼接各段音频、一次编码的 ffmpeg 命令"""
+    settings = settings or load_settings()
+    in_fps, out_fps = frame_rates(in_fps, out_fps, settings)
+    inputs = []
+    filters = []
+    for n, audio in enumerate(audio_files):
+        inputs += ["-i", str(audio)]
+        filters.append(f"[{n + 1}:a]aresample=44100,aformat=channel_layouts=stereo[a{n}]")
+    labels = ''.join(f"[a{n}]" for n in range(len(audio_files)))
+    filters.append(f"{labels}concat=n={len(audio_files)}:v=0:a=1[a]")
+
+    return [
+        "ffmpeg", "-y",
+        "-f", "rawvideo", "-pix_fmt", "rgb24",
+        "-s", f"{WIDTH}x{HEIGHT}", "-framerate", str(in_fps),
+        "-i", "pipe:0",
+        *inputs,
+        "-filter_complex", ";".join(filters),
+        "-map", "0:v", "-map", "[a]",
+        "-r", str(out_fps),
+        *encoder_args(settings, out_fps),
+        str(output_file),
+    ]
+
+def render_stills(segments, output_file, font_path=None, in_fps=None, out_fps=None, settings=None):
+    """
+    渲染静止画面片段序列
+
+    segments: [(背景图片, 字幕文字, 音频文件, 时长秒)]
+    帧数按累计时长取整，避免逐段取整造成音画漂移；成功返回输出路径，失败返回 None
+    """
+    output_file = Path(output_file)
+    settings = settings or load_settings()
+    in_fps, out_fps = frame_rates(in_fps, out_fps, settings)
+    cmd = build_command([audio for _, _, audio, _ in segments], output_file, in_fps, out_fps, settings)
+    print(f"\n内存合成 {len(segments)} 个片段 -> {output_file.name}")
+
+    start = time.perf_counter()
+    with tempfile.TemporaryFile() as log:
+        try:
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                    stdout=subprocess.DEVNULL, stderr=log)
+        except FileNotFoundError:
+            print("  ❌ 未找到 ffmpeg")
+            return None
+
+        elapsed = 0.0
+        written = 0
+        try:
+            for n, (image, text, _, duration) in enumerate(segments, 1):
+                frame = compose_frame(image, text, font_path).tobytes()
+                elapsed += duration
+                target = round(elapsed * in_fps)
+                for _ in range(target - written):
+                    proc.stdin.write(frame)
+                print(f"  片段 {n}: {duration:.2f}秒，{target - written} 帧")
+                written = target
+        except BrokenPipeError:
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        proc.wait()
+
+        if proc.returncode != 0 or not output_file.exists():
+            log.seek(0)
+            print(f"  ❌ 渲染失败: {log.read().decode('utf-8', 'replace')[-300:]}")
+            return None
+
+    print(f"  ✅ 渲染完成: {time.perf_counter() - start:.2f}秒，共 {written} 帧，"
+          f"{output_file.stat().st_size:,} 字节")
+    return output_file
+
+def main():
+    """主函数"""
+    print("=" * 60)
+    print("内存合成模式创建惊蛰视频")
+    print("=" * 60)
+
+    subtitles = [
+        "惊蛰，是二十四节气中的第三个节气。",
+        "春雷始鸣，惊醒蛰伏于地下越冬的昆虫。",
+        "此时气温回升，雨水增多，万物开始复苏。",
+        "农民开始春耕，桃花红、李花白，黄莺鸣叫、燕子飞来。",
+        "惊蛰吃梨，寓意远离疾病，开启健康一年。"
+    ]
+
+    audio_files = []
+    for i in range(1, 6):
+        audio_file = AUDIO_DIR / f"jingzhe_{i}.mp3"
+        if not audio_file.exists():
+            audio_file = AUDIO_DIR / f"jingzhe_sentence_{i}.mp3"
+        if not audio_file.exists():
+            print(f"❌ 未找到音频文件 {i}")
+            return None
+        audio_files.append(audio_file)
+
+    image_files = sorted(p for p in IMAGE_DIR.iterdir()
+                         if p.suffix.lower() in ('.jpg', '.jpeg', '.png', '.webp'))
+    if not image_files:
+        print("❌ 没有图片文件")
+        return None
+
+    segments = []
+    for i, (text, audio) in enumerate(zip(subtitles, audio_files)):
+        duration = get_duration(audio) or 4.0
+        segments.append((image_files[i % len(image_files)], text, audio, duration))
+
+    font_path = find_font()
+    return render_stills(segments, OUTPUT_DIR / "jingzhe_compositor.mp4", font_path)
+
+if __name__ == "__main__":
+    main()
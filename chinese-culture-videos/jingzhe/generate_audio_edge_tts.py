@@ -5,9 +5,12 @@
 
 import os
 import subprocess
-import time
 from pathlib import Path
 
+from audio_concat import concat_audio
+import tts_cache
+from tts_scheduler import command_synthesizer, synthesize_all
+
 # 项目路径
 PROJECT_DIR = Path(__file__).parent
 AUDIO_DIR = PROJECT_DIR / "audio"
@@ -22,7 +25,7 @@ sentences = [
     "惊蛰吃梨，寓意远离疾病，开启健康一年。"
 ]
 
-def run_edge_tts_script(text, output_file):
+def run_edge_tts_script(text, output_file, voice="zh-CN-XiaoxiaoNeural", rate="default", pitch="default"):
     """运行edge-tts脚本生成音频"""
     print(f"生成: {text[:20]}...")
     
@@ -34,25 +37,19 @@ def run_edge_tts_script(text, output_file):
         print(f"错误: 未找到edge-tts脚本: {tts_script}")
         return False
     
-    # 构建命令
+    # 构建命令（在脚本目录下运行，不切换当前进程的工作目录，可并行调用）
     cmd = [
-        "node", str(tts_script),
-        f'"{text}"',
-        "--voice", "zh-CN-XiaoxiaoNeural",
-        "--output", str(output_file)
+        "node", "tts-converter.js", text,
+        "--voice", voice,
+        "--rate", rate,
+        "--pitch", pitch,
+        "--output", str(Path(output_file).absolute())
     ]
     
-    print(f"命令: {' '.join(cmd)}")
-    
     try:
-        # 切换到脚本目录
-        os.chdir(tts_script.parent)
-        
-        # 运行命令
         result = subprocess.run(
-            ["node", "tts-converter.js", text, 
-             "--voice", "zh-CN-XiaoxiaoNeural",
-             "--output", str(output_file)],
+            cmd,
+            cwd=tts_script.parent,
             capture_output=True,
             text=True,
             timeout=30
@@ -69,27 +66,42 @@ def run_edge_tts_script(text, output_file):
         print(f"  异常: {e}")
         return False
 
-def generate_audio_with_edge_tts():
-    """使用edge-tts生成音频"""
+def generate_audio_with_edge_tts(concurrency=3):
+    """
+    使用edge-tts生成音频：先查配音缓存，未命中的句子并发合成，由令牌桶限速（代替每句之后固定 sleep 2 秒）
+    设置环境变量 TTS_COMMAND 可替换合成命令（如本地桩命令），模板语法见 tts_scheduler
+    """
     print("使用edge-tts生成惊蛰配音音频...")
-    
-    all_audio_files = []
-    
-    for i, sentence in enumerate(sentences, 1):
-        output_file = AUDIO_DIR / f"jingzhe_sentence_{i}.mp3"
-        
-        if run_edge_tts_script(sentence, output_file):
-            # 检查文件是否生成
-            if output_file.exists() and output_file.stat().st_size > 0:
-                file_size = output_file.stat().st_size
-                print(f"  文件大小: {file_size} 字节")
-                all_audio_files.append(output_file)
-            else:
-                print(f"  警告: 文件可能为空或未生成")
-        
-        # 避免请求过快
-        time.sleep(2)
-    
+
+    voice = {"name": "zh-CN-XiaoxiaoNeural", "rate": "default", "pitch": "default"}
+    engine = "edge-tts"
+    if os.environ.get("TTS_COMMAND"):
+        engine = f"command:{os.environ['TTS_COMMAND']}"
+        run = command_synthesizer(os.environ["TTS_COMMAND"])
+    else:
+        def run(text, output_file, voice):
+            return run_edge_tts_script(text, output_file, voice["name"], voice["rate"], voice["pitch"])
+    prosody = {"rate": voice["rate"], "pitch": voice["pitch"]}
+
+    def synth(text, output_file, voice):
+        # 旧的输出文件可能与配音缓存共用 inode，先删除，避免覆盖写入破坏缓存内容
+        output_file.unlink(missing_ok=True)
+        if not run(text, output_file, voice):
+            return False
+        tts_cache.store(text, output_file, engine, voice["name"], **prosody)
+        return True
+
+    jobs = [(sentence, AUDIO_DIR / f"jingzhe_sentence_{i}.mp3")
+            for i, sentence in enumerate(sentences, 1)]
+    # 命中缓存的句子不占用限速令牌
+    pending = [(text, output_file) for text, output_file in jobs
+               if not tts_cache.fetch(text, output_file, engine, voice["name"], **prosody)]
+    if pending:
+        synthesize_all(pending, synth, concurrency=concurrency, voice=voice)
+
+    all_audio_files = [f for _, f in jobs if f.exists() and f.stat().st_size > 0]
+    for f in all_audio_files:
+        print(f"  {f.name}: {f.stat().st_size} 字节")
     return all_audio_files
 
 def create_simple_audio_alternative():
@@ -141,15 +153,8 @@ tts("惊蛰，是二十四节气中的第三个节气。")
 
 ## 合并音频
 ```bash
-# 使用FFmpeg合并
-ffmpeg -f concat -safe 0 -i audio_list.txt -c copy audio/jingzhe_full.mp3
-
-# audio_list.txt内容：
-file 'jingzhe_sentence_1.mp3'
-file 'jingzhe_sentence_2.mp3'
-file 'jingzhe_sentence_3.mp3'
-file 'jingzhe_sentence_4.mp3'
-file 'jingzhe_sentence_5.mp3'
+# 按帧拼接（纯 Python，无需 FFmpeg），--gap 可加句间停顿（秒）
+python3 audio_concat.py audio/jingzhe_full.mp3 audio/jingzhe_sentence_{{1..5}}.mp3
 ```
 """
     
@@ -179,8 +184,8 @@ def main():
     if audio_files:
         print(f"\n成功生成 {len(audio_files)} 个音频文件")
         
-        # 创建合并脚本
-        create_merge_script(audio_files)
+        # 合并音频
+        concat_audio(audio_files, AUDIO_DIR / "jingzhe_full.mp3")
     else:
         print("\nedge-tts生成失败，创建替代方案")
         create_simple_audio_alternative()
@@ -189,47 +194,5 @@ def main():
     print("音频生成完成！")
     print("=" * 50)
 
-def create_merge_script(audio_files):
-    """创建合并脚本"""
-    print("\n创建音频合并脚本...")
-    
-    # 创建文件列表
-    list_file = AUDIO_DIR / "audio_list.txt"
-    with open(list_file, 'w') as f:
-        for audio_file in audio_files:
-            f.write(f"file '{audio_file.name}'\n")
-    
-    # 创建合并脚本
-    script_content = f"""#!/bin/bash
-# 合并惊蛰音频脚本
-
-echo "合并惊蛰音频..."
-
-# 检查FFmpeg
-if ! command -v ffmpeg &> /dev/null; then
-    echo "错误: FFmpeg未安装"
-    echo "请安装: sudo apt install ffmpeg"
-    exit 1
-fi
-
-# 合并音频
-ffmpeg -f concat -safe 0 -i {list_file.name} -c copy {AUDIO_DIR}/jingzhe_full.mp3
-
-if [ $? -eq 0 ]; then
-    echo "成功合并音频: {AUDIO_DIR}/jingzhe_full.mp3"
-    echo "文件信息:"
-    ffmpeg -i {AUDIO_DIR}/jingzhe_full.mp3 2>&1 | grep -E "Duration|Stream"
-else
-    echo "合并失败"
-fi
-"""
-    
-    script_file = AUDIO_DIR / "merge_audio.sh"
-    script_file.write_text(script_content)
-    script_file.chmod(0o755)
-    
-    print(f"合并脚本已创建: {script_file}")
-    print(f"运行命令: bash {script_file}")
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+图片预处理：缩放/裁剪到小红书竖屏 1080x1440
+纯 Pillow 实现，不再为每张图片启动一次 ffmpeg，也不拉伸变形：
+1. JPEG 用 Image.draft 在 DCT 域直接按 1/2、1/4、1/8 解码，大图不必完整解码
+   （WebP/PNG 没有 draft，只能完整解码，之后的 reduce() 仍然很快）
+2. reduce() 整数倍快速缩小到目标尺寸的 2 倍左右
+3. 最后只做一次 LANCZOS 重采样
+多张图片在进程池中并行处理，结果经 render_cache 缓存
+
+模式:
+  cover    铺满画面，居中裁掉多余部分（默认）
+  contain  完整显示，上下或左右补黑边
+  saliency 铺满画面，裁剪窗口落在边缘最丰富（主体所在）的位置
+
+用法:
+  python3 image_prep.py images/*.jpg images/*.webp --mode saliency
+"""
+
+import argparse
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageFilter
+
+from render_cache import cached_build
+
+# 项目路径
+PROJECT_DIR = Path(__file__).parent
+IMAGE_DIR = PROJECT_DIR / "images"
+
+TARGET_SIZE = (1080, 1440)
+MODES = ('cover', 'contain', 'saliency')
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif'}
+JPEG_QUALITY = 92
+
+# EXIF 方向 -> 纠正用的变换（5-8 需要交换宽高）
+_ORIENTATION = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+def _saliency_offset(img, crop_w, crop_h):
+    """
+    在缩略图上用边缘强度估计主体位置，返回裁剪窗口左上角（原图坐标）
+    只沿有富余的方向滑动窗口，取窗口内边缘强度之和最大的位置
+    """
+    w, h = img.size
+    thumb = img.convert('L')
+    thumb.thumbnail((256, 256))
+    edges = thumb.filter(ImageFilter.FIND_EDGES)
+    tw, th = edges.size
+
+    if w - crop_w > h - crop_h:
+        # 左右有富余：每列的平均边缘强度
+        profile = list(edges.resize((tw, 1), Image.BOX).tobytes())
+        window = max(1, round(crop_w * tw / w))
+        scale, slack = w / tw, w - crop_w
+    else:
+        profile = list(edges.resize((1, th), Image.BOX).tobytes())
+        window = max(1, round(crop_h * th / h))
+        scale, slack = h / th, h - crop_h
+
+    best, best_score = 0, -1
+    center = (len(profile) - window) / 2
+    score = sum(profile[:window])
+    for start in range(len(profile) - window + 1):
+        if start:
+            score += profile[start + window - 1] - profile[start - 1]
+        # 分数相同时选离中心近的位置
+        if score > best_score or (score == best_score and abs(start - center) < abs(best - center)):
+            best, best_score = start, score
+    offset = min(max(best * scale, 0), slack)
+
+    if w - crop_w > h - crop_h:
+        return offset, (h - crop_h) / 2
+    return (w - crop_w) / 2, offset
+
+def fit_image(src, size=TARGET_SIZE, mode='cover'):
+    """按模式把图片缩放/裁剪到 size，返回 RGB 图片"""
+    if mode not in MODES:
+        raise ValueError(f"未知模式: {mode}（可选 {', '.join(MODES)}）")
+    out_w, out_h = size
+
+    with Image.open(src) as img:
+        orientation = img.getexif().get(0x0112, 1)
+        transpose = _ORIENTATION.get(orientation)
+        # 方向为 5-8 时原始像素是横竖颠倒的，先按颠倒后的目标尺寸计算
+        if orientation in (5, 6, 7, 8):
+            out_w, out_h = out_h, out_w
+
+        w, h = img.size
+        if mode == 'contain':
+            scale = min(out_w / w, out_h / h)
+        else:
+            scale = max(out_w / w, out_h / h)
+
+        # JPEG：在 DCT 域按 1/2^n 解码，解码后尺寸仍不小于所需尺寸
+        if img.format == 'JPEG' and scale < 1:
+            img.draft('RGB', (math.ceil(w * scale), math.ceil(h * scale)))
+        img = img.convert('RGB')
+
+    w, h = img.size
+    if mode == 'contain':
+        scale = min(out_w / w, out_h / h)
+        fit_w, fit_h = max(1, round(w * scale)), max(1, round(h * scale))
+        box = (0, 0, w, h)
+    else:
+        scale = max(out_w / w, out_h / h)
+        fit_w, fit_h = out_w, out_h
+        crop_w, crop_h = out_w / scale, out_h / scale
+        if mode == 'saliency':
+            x0, y0 = _saliency_offset(img, crop_w, crop_h)
+        else:
+            x0, y0 = (w - crop_w) / 2, (h - crop_h) / 2
+        box = (x0, y0, x0 + crop_w, y0 + crop_h)
+
+    # reduce() 整数倍缩小，保留约 2 倍余量给最后一次 LANCZOS
+    factor = int(min((box[2] - box[0]) / fit_w, (box[3] - box[1]) / fit_h) / 2)
+    if factor > 1:
+        ibox = (int(box[0]), int(box[1]), min(w, math.ceil(box[2])), min(h, math.ceil(box[3])))
+        img = img.reduce(factor, box=ibox)
+        box = tuple((v - ibox[i % 2]) / factor for i, v in enumerate(box))
+    result = img.resize((fit_w, fit_h), Image.LANCZOS, box=box)
+
+    if mode == 'contain' and (fit_w, fit_h) != (out_w, out_h):
+        canvas = Image.new('RGB', (out_w, out_h), (0, 0, 0))
+        canvas.paste(result, ((out_w - fit_w) // 2, (out_h - fit_h) // 2))
+        result = canvas
+
+    if transpose is not None:
+        result = result.transpose(transpose)
+    return result
+
+def prepare_image(src, dst, size=TARGET_SIZE, mode='cover', quality=JPEG_QUALITY):
+    """处理一张图片并保存为 JPEG；源图和参数都没变时复用缓存。返回 (输出路径或 None, 耗时)"""
+    start = time.perf_counter()
+    src, dst = Path(src), Path(dst)
+
+    def build(out):
+        fit_image(src, size, mode).save(out, 'JPEG', quality=quality, optimize=True)
+        return True
+
+    try:
+        result = cached_build(dst, ['image-prep', src, tuple(size), mode, quality], build)
+    except (OSError, ValueError) as e:
+        print(f"  ❌ {src.name}: {e}")
+        result = None
+    return result, time.perf_counter() - start
+
+def target_name(src):
+    """输出文件名 resized_<主文件名>_<扩展名>.jpg：同名不同格式的图片（a.jpg 与 a.png）不会写到同一个文件"""
+    src = Path(src)
+    return f"resized_{src.stem}_{src.suffix[1:].lower()}.jpg"
+
+def prepare_images(sources, out_dir, size=TARGET_SIZE, mode='cover', workers=None):
+    """
+    在进程池中并行处理多张图片，输出 out_dir/resized_<主文件名>_<扩展名>.jpg
+    返回与 sources 顺序一致的输出路径列表（失败的为 None）；输出文件名重复时抛出 ValueError
+    """
+    sources = [Path(p) for p in sources]
+    out_dir = Path(out_dir)
+    targets = [out_dir / target_name(src) for src in sources]
+    seen = {}
+    for src, dst in zip(sources, targets):
+        if dst in seen:
+            raise ValueError(f"{seen[dst].name} 与 {src.name} 的输出文件名相同: {dst.name}")
+        seen[dst] = src
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(prepare_image, src, dst, tuple(size), mode)
+                   for src, dst in zip(sources, targets)]
+        results = []
+        for src, future in zip(sources, futures):
+            result, elapsed = future.result()
+            if result:
+                print(f"  ✅ {src.name} -> {result.name}: {elapsed:.2f}秒")
+            results.append(result)
+
+    print(f"图片处理完成: {sum(1 for r in results if r)}/{len(sources)} 张，"
+          f"模式 {mode}，总耗时 {time.perf_counter() - start:.2f}秒")
+    return results
+
+def image_files(directory=IMAGE_DIR):
+    """目录下的图片文件（按文件名排序，跳过说明文档和子目录）"""
+    return sorted(p for p in Path(directory).iterdir()
+                  if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS)
+
+def main():
+    parser = argparse.ArgumentParser(description='把图片缩放/裁剪为 1080x1440 竖屏画面')
+    parser.add_argument('images', nargs='*', help='图片文件（默认 images/ 下全部图片）')
+    parser.add_argument('--mode', choices=MODES, default='cover')
+    parser.add_argument('--out', default=str(IMAGE_DIR / "resized"), help='输出目录')
+    parser.add_argument('--workers', type=int, default=None, help='进程数（默认 CPU 核数）')
+    args = parser.parse_args()
+
+    sources = args.images or image_files()
+    prepare_images(sources, args.out, mode=args.mode, workers=args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+媒体文件探测
+取代各脚本里逐个文件启动 ffprobe 的 get_duration：
+1. MP3/WAV/JPEG/PNG/WebP 直接解析文件头得到时长或尺寸（不启动进程）
+2. 其余文件（MP4 等）合并成一次 ffmpeg -i a -i b ... 调用，从输出中解析时长和画面尺寸
+3. 结果按 (修改时间, 大小) 缓存在 output/.cache/media_probe.json，文件没变时重复运行不再探测
+
+用法:
+  python3 media_probe.py audio/*.mp3 images/*
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import mp3_frames
+
+# 项目路径
+PROJECT_DIR = Path(__file__).parent
+CACHE_FILE = PROJECT_DIR / "output" / ".cache" / "media_probe.json"
+
+_lock = threading.Lock()
+_cache = None
+_dirty = False
+
+# ---------- 纯 Python 文件头解析 ----------
+
+def _wav_info(f):
+    """RIFF/WAVE：读取 fmt 块的字节率和 data 块大小"""
+    f.seek(12)
+    byte_rate = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, size = chunk[:4], int.from_bytes(chunk[4:], 'little')
+        if chunk_id == b'fmt ':
+            fmt = f.read(size)
+            byte_rate = int.from_bytes(fmt[8:12], 'little')
+            if size % 2:
+                f.seek(1, 1)
+        elif chunk_id == b'data':
+            if not byte_rate:
+                return None
+            # 部分 TTS 工具写入的 data 大小不准确，以实际剩余字节为准
+            remaining = os.fstat(f.fileno()).st_size - f.tell()
+            size = min(size, remaining) if size else remaining
+            return {'format': 'wav', 'duration': size / byte_rate}
+        else:
+            f.seek(size + (size % 2), 1)
+
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def _jpeg_info(f):
+    """JPEG：跳过各个段，读取 SOF 段中的宽高"""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue
+        length = int.from_bytes(f.read(2), 'big')
+        if marker in _SOF_MARKERS:
+            data = f.read(5)
+            height = int.from_bytes(data[1:3], 'big')
+            width = int.from_bytes(data[3:5], 'big')
+            return {'format': 'jpeg', 'width': width, 'height': height}
+        if marker == 0xDA or length < 2:
+            return None
+        f.seek(length - 2, 1)
+
+def _png_info(header):
+    if header[12:16] != b'IHDR':
+        return None
+    return {'format': 'png',
+            'width': int.from_bytes(header[16:20], 'big'),
+            'height': int.from_bytes(header[20:24], 'big')}
+
+def _webp_info(header):
+    """WebP：VP8（有损）、VP8L（无损）、VP8X（扩展）三种格式"""
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        width = int.from_bytes(header[26:28], 'little') & 0x3FFF
+        height = int.from_bytes(header[28:30], 'little') & 0x3FFF
+    elif chunk == b'VP8L':
+        bits = int.from_bytes(header[21:25], 'little')
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+    elif chunk == b'VP8X':
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+    else:
+        return None
+    return {'format': 'webp', 'width': width, 'height': height}
+
+def probe_header(path):
+    """
+    按文件开头的魔数识别格式并解析，不支持的格式返回 None（交给 ffmpeg）
+    注意按内容而不是扩展名判断：pyttsx3 生成的 .mp3 实际是 WAV
+    """
+    with open(path, 'rb') as f:
+        header = f.read(32)
+        if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+            return _wav_info(f)
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return _webp_info(header)
+        if header[:8] == b'\x89PNG\r\n\x1a\n':
+            return _png_info(header)
+        if header[:2] == b'\xff\xd8':
+            return _jpeg_info(f)
+    if header[:3] == b'ID3' or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        info = mp3_frames.info(path)
+        if info:
+            return {'format': 'mp3', 'duration': info['duration']}
+    return None
+
+# ---------- 批量 ffmpeg 探测 ----------
+
+_INPUT_RE = re.compile(r"^Input #(\d+), (.+?), from '(.*)':\s*$")
+_DURATION_RE = re.compile(r"^\s+Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_VIDEO_RE = re.compile(r"^\s+Stream #\d+:\d+.*?: Video: .*?(\d{2,5})x(\d{2,5})")
+
+def parse_ffmpeg_inputs(stderr):
+    """解析 ffmpeg -i 输出中每个 Input 的格式、时长和首个视频流尺寸，按输入序号返回"""
+    results = {}
+    current = None
+    for line in stderr.splitlines():
+        match = _INPUT_RE.match(line)
+        if match:
+            current = {'format': match.group(2).split(',')[0]}
+            results[int(match.group(1))] = current
+            continue
+        if current is None:
+            continue
+        match = _DURATION_RE.match(line)
+        if match:
+            h, m, s = match.groups()
+            current['duration'] = int(h) * 3600 + int(m) * 60 + float(s)
+            continue
+        match = _VIDEO_RE.match(line)
+        if match and 'width' not in current:
+            current['width'], current['height'] = int(match.group(1)), int(match.group(2))
+    return results
+
+def probe_with_ffmpeg(paths):
+    """
+    一次 ffmpeg 调用探测多个文件；某个输入打不开时 ffmpeg 会在该处停止，
+    此时跳过它，对剩余文件再调用一次
+    """
+    results = {}
+    pending = list(paths)
+    while pending:
+        cmd = ["ffmpeg", "-hide_banner", "-nostdin"]
+        for path in pending:
+            cmd += ["-i", str(path)]
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True, errors='replace')
+        except FileNotFoundError:
+            print("  ⚠️  未找到 ffmpeg，无法探测: " + ", ".join(Path(p).name for p in pending))
+            break
+        parsed = parse_ffmpeg_inputs(proc.stderr)
+        for index, info in parsed.items():
+            results[pending[index]] = info
+        failed = len(parsed)
+        pending = pending[failed + 1:]
+    return results
+
+# ---------- 缓存 ----------
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        try:
+            _cache = json.loads(CACHE_FILE.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            _cache = {}
+    return _cache
+
+def save_cache():
+    """把新探测的结果写回缓存文件"""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_FILE.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(_cache, ensure_ascii=False, indent=1), encoding='utf-8')
+        os.replace(tmp, CACHE_FILE)
+        _dirty = False
+
+def probe_many(paths):
+    """
+    探测多个文件，返回 {路径字符串: 信息字典或 None}
+    信息字典包含 format，以及 duration（音视频）和/或 width、height（图片、视频）
+    """
+    global _dirty
+    results = {str(path): None for path in paths}
+    stamps = {}
+    to_ffmpeg = []
+
+    with _lock:
+        cache = _load_cache()
+
+    for path in paths:
+        key = str(Path(path).resolve())
+        try:
+            st = os.stat(key)
+        except OSError:
+            continue
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = cache.get(key)
+        if entry and entry['stamp'] == stamp:
+            results[str(path)] = entry['info']
+            continue
+
+        stamps[key] = stamp
+        info = probe_header(key) if st.st_size else None
+        if info is None and st.st_size:
+            to_ffmpeg.append(key)
+            continue
+        results[str(path)] = info
+
+    if to_ffmpeg:
+        probed = probe_with_ffmpeg(to_ffmpeg)
+        for path in paths:
+            key = str(Path(path).resolve())
+            if key in to_ffmpeg:
+                results[str(path)] = probed.get(key)
+
+    with _lock:
+        for path in paths:
+            key = str(Path(path).resolve())
+            info = results[str(path)]
+            # 交给 ffmpeg 但没有结果的文件不缓存（可能只是当前环境缺少 ffmpeg）
+            if key in stamps and (info is not None or key not in to_ffmpeg):
+                cache[key] = {'stamp': stamps[key], 'info': info}
+                _dirty = True
+    save_cache()
+    return results
+
+def probe(path):
+    """探测单个文件，返回信息字典，无法识别时返回 None"""
+    return probe_many([path])[str(path)]
+
+def get_duration(file_path):
+    """获取媒体文件时长（秒），无法获取时返回 0.0"""
+    info = probe(file_path)
+    return (info or {}).get('duration') or 0.0
+
+def get_dimensions(file_path):
+    """获取图片/视频尺寸 (宽, 高)，无法获取时返回 None"""
+    info = probe(file_path) or {}
+    if 'width' in info:
+        return info['width'], info['height']
+    return None
+
+def main():
+    results = probe_many(sys.argv[1:])
+    for path, info in results.items():
+        if not info:
+            print(f"{path}: 无法识别")
+            continue
+        parts = [info['format']]
+        if info.get('duration') is not None:
+            parts.append(f"{info['duration']:.3f}秒")
+        if 'width' in info:
+            parts.append(f"{info['width']}x{info['height']}")
+        print(f"{path}: {', '.join(parts)}")
+
+if __name__ == "__main__":
+    main()
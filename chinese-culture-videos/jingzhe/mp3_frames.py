@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+纯 Python 的 MP3 帧解析
+跳过 ID3v2 标签，逐帧读取帧头计算时长；有 Xing/Info 头（VBR/LAME）时直接用其中的总帧数，
+不需要启动 ffprobe 进程
+
+用法:
+  python3 mp3_frames.py audio/*.mp3
+"""
+
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+# 比特率表（kbps），按 (MPEG-1, MPEG-2/2.5) 和层区分
+_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# 采样率表，按版本位（0: MPEG-2.5, 2: MPEG-2, 3: MPEG-1）
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+FrameHeader = namedtuple('FrameHeader', [
+    'version', 'layer', 'bitrate', 'sample_rate', 'padding',
+    'channels', 'samples', 'length',
+])
+
+def parse_header(data, offset=0):
+    """解析 offset 处的 4 字节帧头，不是合法帧头时返回 None"""
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset:offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_idx = (b2 >> 4) & 0x0F
+    rate_idx = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+
+    layer = 4 - layer_bits
+    mpeg1 = version_bits == 3
+    bitrate = _BITRATES[(1 if mpeg1 else 2, layer)][bitrate_idx] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][rate_idx]
+    padding = (b2 >> 1) & 0x01
+    channels = 1 if (b3 >> 6) == 3 else 2
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or mpeg1:
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 576
+        length = 72 * bitrate // sample_rate + padding
+
+    version = {3: 1, 2: 2, 0: 2.5}[version_bits]
+    return FrameHeader(version, layer, bitrate, sample_rate, padding, channels, samples, length)
+
+def id3v2_size(data):
+    """文件开头 ID3v2 标签的总字节数（没有标签时为 0）"""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    size = 0
+    for b in data[6:10]:
+        size = (size << 7) | (b & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+def find_first_frame(data, offset=0, max_scan=1 << 16):
+    """
+    从 offset 开始寻找第一个帧头；要求紧随其后的位置也是合法帧头，避免误认为数据中的 0xFF
+    """
+    end = min(len(data), offset + max_scan)
+    pos = data.find(b'\xff', offset, end)
+    while pos != -1:
+        header = parse_header(data, pos)
+        if header:
+            nxt = pos + header.length
+            if nxt + 4 > len(data) or parse_header(data, nxt):
+                return pos, header
+        pos = data.find(b'\xff', pos + 1, end)
+    return None, None
+
+def side_info_size(header):
+    """帧头之后 side info 的字节数（Layer III，不含 CRC）"""
+    if header.version == 1:
+        return 17 if header.channels == 1 else 32
+    return 9 if header.channels == 1 else 17
+
+def info_tag(data, offset, header):
+    """offset 处的帧是否是 Xing/Info/VBRI 信息帧，是时返回标记名，否则返回 None"""
+    pos = offset + 4 + side_info_size(header)
+    tag = data[pos:pos + 4]
+    if tag in (b'Xing', b'Info'):
+        return tag.decode()
+    # VBRI 头固定在帧头后 32 字节
+    if data[offset + 36:offset + 40] == b'VBRI':
+        return 'VBRI'
+    return None
+
+def xing_frames(data, offset, header):
+    """读取 Xing/Info 或 VBRI 头中的总帧数（不含该信息帧本身），没有时返回 None"""
+    tag = info_tag(data, offset, header)
+    if tag in ('Xing', 'Info'):
+        pos = offset + 4 + side_info_size(header)
+        flags = int.from_bytes(data[pos + 4:pos + 8], 'big')
+        if flags & 0x01:
+            return int.from_bytes(data[pos + 8:pos + 12], 'big')
+        return None
+    if tag == 'VBRI':
+        pos = offset + 4 + 32
+        return int.from_bytes(data[pos + 14:pos + 18], 'big')
+    return None
+
+def iter_frames(data, offset=0):
+    """依次产出 (偏移, 帧头)；遇到 ID3v1 标签或无法再同步时结束"""
+    pos, header = find_first_frame(data, offset)
+    while header:
+        yield pos, header
+        pos += header.length
+        if data[pos:pos + 3] == b'TAG':
+            return
+        header = parse_header(data, pos)
+        if header is None and pos < len(data) - 4:
+            pos, header = find_first_frame(data, pos, max_scan=4096)
+
+def info(path):
+    """
+    MP3 文件信息：{'duration', 'sample_rate', 'channels', 'bitrate', 'frames'}
+    不是 MP3 时返回 None
+    """
+    data = Path(path).read_bytes()
+    start = id3v2_size(data)
+    first_pos, first = find_first_frame(data, start)
+    if first is None:
+        return None
+
+    frames = xing_frames(data, first_pos, first)
+    if frames is not None:
+        samples = frames * first.samples
+        audio_bytes = len(data) - first_pos - first.length
+    else:
+        frames = 0
+        samples = 0
+        for _, header in iter_frames(data, first_pos):
+            frames += 1
+            samples += header.samples
+        audio_bytes = len(data) - first_pos
+
+    duration = samples / first.sample_rate
+    bitrate = int(audio_bytes * 8 / duration) if duration else first.bitrate
+    return {
+        'duration': duration,
+        'sample_rate': first.sample_rate,
+        'channels': first.channels,
+        'bitrate': bitrate,
+        'frames': frames,
+    }
+
+def duration(path):
+    """MP3 时长（秒），无法解析时返回 0.0"""
+    try:
+        result = info(path)
+    except OSError:
+        return 0.0
+    return result['duration'] if result else 0.0
+
+def main():
+    for arg in sys.argv[1:]:
+        result = info(arg)
+        if result:
+            print(f"{arg}: {result['duration']:.3f}秒, {result['sample_rate']}Hz, "
+                  f"{result['channels']}声道, {result['bitrate'] // 1000}kbps, {result['frames']}帧")
+        else:
+            print(f"{arg}: 不是 MP3 文件")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+内容寻址的渲染缓存
+以所有输入的哈希（源文件字节、文字、字体、尺寸、ffmpeg 参数）作为键，
+产物保存在 output/.cache/ 下；输入没变的产物直接复用，只重新渲染变化的部分
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent
+CACHE_DIR = PROJECT_DIR / "output" / ".cache"
+
+_digest_lock = threading.Lock()
+_digests = {}
+
+def file_digest(path):
+    """文件内容的 sha256，按 (路径, 修改时间, 大小) 记忆，同一进程内不重复读取"""
+    path = Path(path)
+    st = path.stat()
+    memo_key = (str(path.resolve()), st.st_mtime_ns, st.st_size)
+    with _digest_lock:
+        digest = _digests.get(memo_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with _digest_lock:
+            _digests[memo_key] = digest
+    return digest
+
+def cache_key(*parts):
+    """
+    计算缓存键：Path 按文件内容参与哈希，其余值按 repr 参与哈希
+    （列表/元组会逐项展开，因此 ffmpeg 参数列表中的路径也按内容计算）
+    """
+    h = hashlib.sha256()
+
+    def feed(part):
+        if isinstance(part, Path):
+            h.update(b'F' + file_digest(part).encode())
+        elif isinstance(part, (list, tuple)):
+            h.update(b'[')
+            for item in part:
+                feed(item)
+            h.update(b']')
+        else:
+            h.update(b'V' + repr(part).encode('utf-8'))
+        h.update(b'\0')
+
+    for part in parts:
+        feed(part)
+    return h.hexdigest()
+
+def _place(src, dst):
+    """
+    把缓存文件复制到输出位置（先写临时文件再 os.replace）
+    不用硬链接：输出文件之后被原地改写（ffmpeg -y、编辑器、PIL save）时会连带改坏缓存
+    """
+    tmp = dst.with_name(f"{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+def _is_copy(src, dst):
+    """dst 是 src 的一份独立副本（大小和修改时间相同，且不是同一个 inode）"""
+    try:
+        a, b = src.stat(), dst.stat()
+    except OSError:
+        return False
+    return (a.st_size, a.st_mtime_ns) == (b.st_size, b.st_mtime_ns) and not os.path.samestat(a, b)
+
+def cached_build(output_path, key_parts, build):
+    """
+    有缓存时直接复用产物，否则调用 build(output_path) 生成并存入缓存
+
+    build 返回真值且输出文件非空才视为成功；返回 output_path 或 None
+    """
+    output_path = Path(output_path)
+    key = cache_key(*key_parts)
+    cached = CACHE_DIR / f"{key}{output_path.suffix}"
+
+    if cached.exists():
+        # 早先版本留下的硬链接也在这里换成独立副本
+        if not _is_copy(cached, output_path):
+            _place(cached, output_path)
+        print(f"  ♻️  复用缓存: {output_path.name}")
+        return output_path
+
+    # 输出文件可能是早先版本与缓存的硬链接，先删除，避免覆盖写入破坏缓存内容
+    output_path.unlink(missing_ok=True)
+    if not build(output_path):
+        return None
+    if not output_path.exists() or output_path.stat().st_size == 0:
+        return None
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_suffix(cached.suffix + f".{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.copy2(output_path, tmp)
+    os.replace(tmp, cached)
+    return output_path
+
+def cached_command(output_path, make_cmd, inputs=(), extra=()):
+    """
+    缓存一条外部命令（ffmpeg/convert）的产物
+
+    make_cmd(输出路径) 返回命令参数列表；键由命令模板、inputs 中各文件的内容和 extra 组成。
+    模板中的输出路径和 inputs 的路径都用占位符代替（输入按内容参与哈希），
+    因此输入内容相同、只是文件名不同的产物可共享缓存；命令中未列入 inputs 的路径仍按原样参与哈希
+    """
+    placeholders = sorted(((str(p), f'{{input{i}}}') for i, p in enumerate(inputs)),
+                          key=lambda item: -len(item[0]))
+
+    def generalize(arg):
+        arg = str(arg)
+        for path, placeholder in placeholders:
+            arg = arg.replace(path, placeholder)
+        return arg
+
+    template = [generalize(arg) for arg in make_cmd(Path('{output}'))]
+
+    def build(out):
+        result = subprocess.run(make_cmd(out), capture_output=True)
+        return result.returncode == 0
+
+    key_parts = ['cmd', template, [Path(p) for p in inputs], list(extra)]
+    return cached_build(output_path, key_parts, build)
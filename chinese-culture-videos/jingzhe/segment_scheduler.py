@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+视频片段并行调度
+每个片段的渲染是独立的 ffmpeg 进程，用线程池并行执行（并行数见 default_workers），
+结果按片段编号顺序返回（用于生成 concat 列表），并打印每个片段的耗时
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+def default_workers():
+    """
+    默认并行度：CPU 核数的一半
+    libx264 本身按核数开多个编码线程，每核一个进程会让线程数达到核数的平方量级，
+    互相争抢反而更慢；并行的作用主要是让一个片段的编码与另一个片段的读图、收尾重叠
+    """
+    return max(1, (os.cpu_count() or 1) // 2)
+
+def render_segments(tasks, max_workers=None):
+    """
+    并行渲染片段
+
+    tasks: [(片段编号, 无参函数)]，函数返回片段文件路径，失败返回 None
+    返回与 tasks 顺序一致的结果列表
+    """
+    workers = max_workers or default_workers()
+    workers = max(1, min(workers, len(tasks)))
+    print(f"\n并行渲染 {len(tasks)} 个片段（{workers} 个进程并行）...")
+
+    def timed(func):
+        start = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            print(f"  ❌ 片段渲染异常: {e}")
+            result = None
+        return result, time.perf_counter() - start
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(timed, func) for _, func in tasks]
+        outcomes = [f.result() for f in futures]
+    wall = time.perf_counter() - wall_start
+
+    print("\n片段耗时:")
+    for (num, _), (result, elapsed) in zip(tasks, outcomes):
+        status = "✅" if result else "❌"
+        print(f"  {status} 片段 {num}: {elapsed:.2f}秒")
+    busy = sum(elapsed for _, elapsed in outcomes)
+    print(f"  总耗时 {wall:.2f}秒（串行需 {busy:.2f}秒，加速 {busy / wall if wall else 1:.1f}x）")
+
+    return [result for result, _ in outcomes]
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+按像素宽度排版中文字幕
+用字体的真实字宽（FreeTypeFont.getlength，逐字缓存）计算行宽，而不是按字符数换行；
+遵守中文避头尾规则（"，。）" 等不出现在行首，"（《" 等不出现在行尾），
+并用二分查找选出能放进指定像素框的最大字号
+"""
+
+import re
+from collections import namedtuple
+
+# 不能出现在行首的字符（标点、后括号、后引号）
+NO_LINE_START = set("，。、；：？！）》」』】〕〉］｝”’…—·～%"
+                    ",.;:?!)]}%")
+# 不能出现在行尾的字符（前括号、前引号）
+NO_LINE_END = set("（《「『【〔〈［｛“‘([{")
+
+# 西文单词和数字整体作为一个单位，不在中间断开；其余字符逐字处理
+TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:[.'\-][A-Za-z0-9]+)*|\s+|.", re.S)
+
+Layout = namedtuple('Layout', ['font_size', 'lines', 'widths', 'line_height'])
+
+# (字体路径, 字号) -> {文字片段: 宽度}
+_advances = {}
+
+def _advance_table(font):
+    key = (getattr(font, 'path', None) or id(font), getattr(font, 'size', None))
+    table = _advances.get(key)
+    if table is None:
+        table = _advances[key] = {}
+    return table
+
+def measure(font, token, table=None):
+    """文字片段的前进宽度（像素），按字体缓存"""
+    if table is None:
+        table = _advance_table(font)
+    width = table.get(token)
+    if width is None:
+        width = table[token] = font.getlength(token)
+    return width
+
+def break_lines(text, font, max_width):
+    """
+    按像素宽度贪心换行，返回 (各行文字, 各行宽度)
+
+    需要断行时，若下一个片段不能出现在行首，则把当前行最后一个字一起带到下一行；
+    当前行末尾若是不能出现在行尾的字符，也移到下一行
+    """
+    table = _advance_table(font)
+    lines = []
+    widths = []
+    current = []
+    current_width = 0.0
+
+    def flush(tokens):
+        while tokens and tokens[-1].isspace():
+            tokens = tokens[:-1]
+        if tokens:
+            lines.append(''.join(tokens))
+            widths.append(sum(measure(font, t, table) for t in tokens))
+
+    for token in TOKEN_RE.findall(text.replace('\n', ' ')):
+        width = measure(font, token, table)
+        if current and current_width + width > max_width and not token.isspace():
+            carry = []
+            if token[0] in NO_LINE_START:
+                while len(current) > 1:
+                    moved = current.pop()
+                    carry.insert(0, moved)
+                    if moved[0] not in NO_LINE_START:
+                        break
+            while len(current) > 1 and current[-1][-1] in NO_LINE_END:
+                carry.insert(0, current.pop())
+            flush(current)
+            while carry and carry[0].isspace():
+                carry.pop(0)
+            current = carry
+            current_width = sum(measure(font, t, table) for t in current)
+        if token.isspace() and not current:
+            continue
+        current.append(token)
+        current_width += width
+
+    flush(current)
+    return lines, widths
+
+def layout_text(text, font, max_width, line_spacing=1.25):
+    """用指定字体排版"""
+    lines, widths = break_lines(text, font, max_width)
+    size = getattr(font, 'size', 10)
+    return Layout(size, tuple(lines), tuple(widths), round(size * line_spacing))
+
+def fit_text(text, load_font, max_width, max_height, max_size=48, min_size=16,
+             line_spacing=1.25):
+    """
+    在 max_width x max_height 像素框内排版，二分查找能放下的最大字号
+
+    load_font(字号) 返回字体对象；连最小字号都放不下时按最小字号返回
+    """
+    def fits(layout):
+        return (len(layout.lines) * layout.line_height <= max_height
+                and all(w <= max_width for w in layout.widths))
+
+    best = None
+    lo, hi = min_size, max_size
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        layout = layout_text(text, load_font(mid), max_width, line_spacing)
+        if fits(layout):
+            best = layout
+            lo = mid + 1
+        else:
+            hi = mid - 1
+
+    return best or layout_text(text, load_font(min_size), max_width, line_spacing)
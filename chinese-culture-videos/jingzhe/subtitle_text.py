@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+字幕文字渲染公共模块
+每个进程只查找一次可显示中文的字体；FreeTypeFont 按 (路径, 字号) 缓存，
+排版结果（见 subtitle_layout）和文字包围盒按字符串缓存，批量生成字幕时不再反复加载字体文件
+"""
+
+import os
+import subprocess
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+from subtitle_layout import fit_text
+
+# 优先使用包含中文字形的字体，最后才退回西文字体（会显示成方框）
+CJK_FONT_PATHS = [
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSerifCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/System/Library/Fonts/STHeiti Medium.ttc",
+]
+FALLBACK_FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "/usr/share/fonts/truetype/ubuntu/Ubuntu-R.ttf",
+]
+
+def _fontconfig_cjk_font():
+    """用 fc-list 查找支持中文的字体文件"""
+    try:
+        result = subprocess.run(["fc-list", ":lang=zh", "file"],
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    for line in sorted(result.stdout.splitlines()):
+        path = line.split(':')[0].strip()
+        if path and os.path.exists(path):
+            return path
+    return None
+
+@lru_cache(maxsize=None)
+def resolve_font():
+    """查找字体（每个进程只查找一次），找不到返回 None"""
+    for path in CJK_FONT_PATHS:
+        if os.path.exists(path):
+            print(f"找到中文字体: {path}")
+            return path
+
+    path = _fontconfig_cjk_font()
+    if path:
+        print(f"找到中文字体: {path}")
+        return path
+
+    for path in FALLBACK_FONT_PATHS:
+        if os.path.exists(path):
+            print(f"警告: 未找到中文字体，使用 {path}")
+            return path
+
+    print("警告: 未找到系统字体，使用默认字体")
+    return None
+
+@lru_cache(maxsize=64)
+def get_font(path, size):
+    """按 (路径, 字号) 缓存的字体对象；加载失败时使用默认字体"""
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            print(f"  警告: 无法加载字体 {path}，使用默认字体")
+    return ImageFont.load_default()
+
+@lru_cache(maxsize=4096)
+def layout_subtitle(text, font_path, max_size, max_width, max_height,
+                    line_spacing=1.25, min_size=20):
+    """按像素框排版（避头尾换行 + 二分字号），结果按参数缓存"""
+    return fit_text(text, lambda size: get_font(font_path, size), max_width, max_height,
+                    max_size=max_size, min_size=min(min_size, max_size),
+                    line_spacing=line_spacing)
+
+@lru_cache(maxsize=16384)
+def text_bbox(path, size, line):
+    """一行文字的包围盒 (left, top, right, bottom)"""
+    return get_font(path, size).getbbox(line)
+
+def render_subtitle(text, size=(1080, 200), font_size=40, max_line_width=None,
+                    line_height=None, background=(0, 0, 0, 180), font_path=None,
+                    padding=20):
+    """
+    绘制居中的多行字幕，返回 RGBA 图片
+
+    按像素宽度换行：每行不超过 max_line_width（默认为图片宽度减去两侧留白），
+    放不下时自动缩小字号（font_size 为上限）；line_height 默认为字号 + 10，
+    字号缩小时按比例缩放；字体默认使用 resolve_font() 的结果
+    """
+    if font_path is None:
+        font_path = resolve_font()
+    width, height = size
+    max_line_width = min(max_line_width or width, width - 2 * padding)
+    line_spacing = (line_height or font_size + 10) / font_size
+
+    layout = layout_subtitle(text, font_path, font_size, max_line_width,
+                             height - 2 * padding, line_spacing)
+    font = get_font(font_path, layout.font_size)
+
+    image = Image.new('RGBA', size, background)
+    draw = ImageDraw.Draw(image)
+
+    y_start = (height - len(layout.lines) * layout.line_height) // 2
+
+    for i, line in enumerate(layout.lines):
+        left, _, right, _ = text_bbox(font_path, layout.font_size, line)
+        x = (width - (right - left)) // 2
+        y = y_start + i * layout.line_height
+
+        # 文本阴影（提高可读性），再绘制白色文字
+        draw.text((x + 2, y + 2), line, font=font, fill=(0, 0, 0, 255))
+        draw.text((x, y), line, font=font, fill=(255, 255, 255, 255))
+
+    return image
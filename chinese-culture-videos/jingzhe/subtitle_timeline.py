@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+按每句配音的实际时长生成字幕时间轴
+读取 audio/jingzhe_sentence_N.mp3 等逐句音频的时长（纯 Python 解析文件头，不启动 ffprobe），
+累加得到每句的起止时间；SRT 和 ASS 都由同一个时间轴生成，两者时间完全一致
+
+用法:
+  python3 subtitle_timeline.py
+"""
+
+from collections import namedtuple
+from pathlib import Path
+
+from media_probe import get_duration
+
+# 项目路径
+PROJECT_DIR = Path(__file__).parent
+AUDIO_DIR = PROJECT_DIR / "audio"
+OUTPUT_DIR = PROJECT_DIR / "output"
+
+Cue = namedtuple('Cue', ['index', 'start', 'end', 'text'])
+
+ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+Collisions: Normal
+PlayDepth: 0
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,40,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,30,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+def audio_duration(path):
+    """
+    音频时长（秒），由 media_probe 解析文件头得到（pyttsx3 生成的 .mp3 实际是 WAV，按内容识别）；
+    文件不存在或无法解析时返回 0.0
+    """
+    return get_duration(path)
+
+# 逐句配音的文件名：pyttsx3 生成 jingzhe_sentence_N.mp3，edge-tts 生成 jingzhe_N.mp3
+PYTTSX3_CLIPS = "jingzhe_sentence_{}.mp3"
+EDGE_TTS_CLIPS = "jingzhe_{}.mp3"
+
+def sentence_audio_files(count, audio_dir=AUDIO_DIR, patterns=(PYTTSX3_CLIPS, EDGE_TTS_CLIPS)):
+    """
+    逐句配音文件：每句按 patterns 的顺序取第一个存在且非空的文件
+    字幕要配合某条合成好的音轨时，只传组成该音轨的那一组文件名
+    """
+    files = []
+    for i in range(1, count + 1):
+        for pattern in patterns:
+            path = audio_dir / pattern.format(i)
+            if path.exists() and path.stat().st_size > 0:
+                break
+        files.append(path)
+    return files
+
+def matches_track(durations, track_duration, tolerance=0.2):
+    """逐句时长都有效，且总和与音轨时长相差不超过 tolerance 秒"""
+    return bool(durations) and all(durations) and abs(sum(durations) - track_duration) <= tolerance
+
+def build_timeline(sentences, durations, gap=0.0):
+    """按时长累加生成时间轴，gap 为句间停顿（秒）"""
+    cues = []
+    t = 0.0
+    for i, (text, duration) in enumerate(zip(sentences, durations), 1):
+        cues.append(Cue(i, t, t + duration, text))
+        t += duration + gap
+    return cues
+
+def _split_time(seconds, unit):
+    """把秒数按 unit（1000 为毫秒，100 为厘秒）取整后拆分为时、分、秒、小数部分"""
+    total = int(round(seconds * unit))
+    frac = total % unit
+    total //= unit
+    return total // 3600, (total % 3600) // 60, total % 60, frac
+
+def srt_time(seconds):
+    """SRT 时间格式: 00:00:00,000"""
+    h, m, s, ms = _split_time(seconds, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+def ass_time(seconds):
+    """ASS 时间格式: 0:00:00.00"""
+    h, m, s, cs = _split_time(seconds, 100)
+    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+
+def to_srt(cues):
+    return ''.join(
+        f"{cue.index}\n{srt_time(cue.start)} --> {srt_time(cue.end)}\n{cue.text}\n\n"
+        for cue in cues
+    )
+
+def to_ass(cues, header=ASS_HEADER):
+    return header + ''.join(
+        f"Dialogue: 0,{ass_time(cue.start)},{ass_time(cue.end)},Default,,0,0,0,,{cue.text}\n"
+        for cue in cues
+    )
+
+def write_subtitles(cues, ass_file, srt_file, header=ASS_HEADER):
+    """同一个时间轴同时写出 ASS 和 SRT"""
+    Path(ass_file).write_text(to_ass(cues, header), encoding='utf-8')
+    Path(srt_file).write_text(to_srt(cues), encoding='utf-8')
+    return ass_file, srt_file
+
+def main():
+    sentences = [
+        "惊蛰，是二十四节气中的第三个节气。",
+        "春雷始鸣，惊醒蛰伏于地下越冬的昆虫。",
+        "此时气温回升，雨水增多，万物开始复苏。",
+        "农民开始春耕，桃花红、李花白，黄莺鸣叫、燕子飞来。",
+        "惊蛰吃梨，寓意远离疾病，开启健康一年。"
+    ]
+    files = sentence_audio_files(len(sentences))
+    durations = [audio_duration(f) for f in files]
+    for f, d in zip(files, durations):
+        print(f"  {f.name}: {d:.3f}秒")
+
+    cues = build_timeline(sentences, durations)
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    ass_file, srt_file = write_subtitles(cues, OUTPUT_DIR / "jingzhe_subtitles_timed.ass",
+                                         OUTPUT_DIR / "jingzhe_subtitles_timed.srt")
+    print(f"字幕时间轴已保存: {ass_file.name}, {srt_file.name}（总时长 {cues[-1].end:.2f}秒）")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+内容寻址的配音缓存
+以 (规范化文本, 引擎, 声音, 语速/音调等参数) 作为键保存合成好的音频，
+命中时直接复用，完全跳过合成；缓存总大小超过上限时按最近使用时间淘汰（LRU）
+
+用法:
+  python3 tts_cache.py              # 查看缓存统计
+  python3 tts_cache.py list         # 列出缓存条目
+  python3 tts_cache.py evict --max-mb 50
+  python3 tts_cache.py clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+from render_cache import CACHE_DIR as RENDER_CACHE_DIR
+
+CACHE_DIR = RENDER_CACHE_DIR / "tts"
+INDEX_FILE = CACHE_DIR / "index.json"
+
+# 缓存上限（MB），可用环境变量 TTS_CACHE_MAX_MB 调整
+MAX_BYTES = int(float(os.environ.get("TTS_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+_lock = threading.Lock()
+
+def normalize_text(text):
+    """NFKC 规范化（全角/半角统一）并合并空白，内容相同的句子得到相同的键"""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', text)).strip()
+
+def tts_key(text, engine, voice, **prosody):
+    """缓存键：规范化文本 + 引擎 + 声音 + 语速/音调等参数"""
+    payload = [normalize_text(text), engine, voice, sorted(prosody.items())]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def _read_index():
+    try:
+        return json.loads(INDEX_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {'entries': {}, 'hits': 0, 'misses': 0}
+
+def _write_index(index):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = INDEX_FILE.with_suffix(f'.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding='utf-8')
+    os.replace(tmp, INDEX_FILE)
+
+def _update_index(change):
+    """读取-修改-写回索引（每次都从磁盘重新读取，多个进程同时使用时尽量不丢记录）"""
+    with _lock:
+        index = _read_index()
+        result = change(index)
+        _write_index(index)
+        return result
+
+def _evict(index, max_bytes):
+    """按最近使用时间从旧到新删除条目，直到总大小不超过上限；返回删除的条目数"""
+    entries = index['entries']
+    total = sum(e['size'] for e in entries.values())
+    removed = 0
+    for key, entry in sorted(entries.items(), key=lambda item: item[1]['last_used']):
+        if total <= max_bytes:
+            break
+        (CACHE_DIR / entry['file']).unlink(missing_ok=True)
+        total -= entry['size']
+        del entries[key]
+        removed += 1
+    return removed
+
+def fetch(text, output_file, engine, voice, **prosody):
+    """命中缓存时把音频复制到 output_file 并返回 True，否则返回 False"""
+    output_file = Path(output_file)
+    key = tts_key(text, engine, voice, **prosody)
+
+    def change(index):
+        entry = index['entries'].get(key)
+        if entry is None or not (CACHE_DIR / entry['file']).exists():
+            index['entries'].pop(key, None)
+            index['misses'] += 1
+            return None
+        entry['last_used'] = time.time()
+        entry['hits'] = entry.get('hits', 0) + 1
+        index['hits'] += 1
+        return CACHE_DIR / entry['file']
+
+    cached = _update_index(change)
+    if cached is None:
+        return False
+
+    # 复制而不是硬链接：之后同一输出位置未命中时，合成程序会直接覆盖写入该文件，
+    # 若与缓存共用一个 inode，就会把另一段文本的音频写进这个缓存条目
+    tmp = output_file.with_name(f"{output_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.copy2(cached, tmp)
+    os.replace(tmp, output_file)
+    print(f"  ♻️  复用配音缓存: {output_file.name}")
+    return True
+
+def store(text, output_file, engine, voice, **prosody):
+    """把合成好的音频存入缓存，并按上限淘汰旧条目"""
+    output_file = Path(output_file)
+    if not output_file.exists() or output_file.stat().st_size == 0:
+        return False
+    key = tts_key(text, engine, voice, **prosody)
+    name = f"{key}{output_file.suffix}"
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_DIR / f"{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    shutil.copy2(output_file, tmp)
+    os.replace(tmp, CACHE_DIR / name)
+
+    def change(index):
+        now = time.time()
+        index['entries'][key] = {
+            'file': name,
+            'text': text,
+            'engine': engine,
+            'voice': voice,
+            'prosody': prosody,
+            'size': output_file.stat().st_size,
+            'created': now,
+            'last_used': now,
+            'hits': 0,
+        }
+        _evict(index, MAX_BYTES)
+
+    _update_index(change)
+    return True
+
+def cached_synthesize(text, output_file, synth, engine, voice, **prosody):
+    """
+    先查缓存，未命中时调用 synth(text, output_file) 合成并存入缓存
+    返回是否得到了音频
+    """
+    if fetch(text, output_file, engine, voice, **prosody):
+        return True
+    # 旧的输出文件可能与缓存共用 inode（早先的版本命中时硬链接），先删除再合成
+    Path(output_file).unlink(missing_ok=True)
+    if not synth(text, output_file):
+        return False
+    store(text, output_file, engine, voice, **prosody)
+    return True
+
+def stats():
+    """缓存统计"""
+    with _lock:
+        index = _read_index()
+    entries = index['entries'].values()
+    lookups = index['hits'] + index['misses']
+    return {
+        'entries': len(index['entries']),
+        'bytes': sum(e['size'] for e in entries),
+        'max_bytes': MAX_BYTES,
+        'hits': index['hits'],
+        'misses': index['misses'],
+        'hit_rate': index['hits'] / lookups if lookups else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='配音缓存管理')
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('stats', help='查看缓存统计（默认）')
+    sub.add_parser('list', help='列出缓存条目（最近使用的在前）')
+    evict = sub.add_parser('evict', help='按 LRU 淘汰到指定大小')
+    evict.add_argument('--max-mb', type=float, default=MAX_BYTES / 1024 / 1024)
+    sub.add_parser('clear', help='清空缓存')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        with _lock:
+            index = _read_index()
+        entries = sorted(index['entries'].values(), key=lambda e: e['last_used'], reverse=True)
+        for e in entries:
+            used = time.strftime('%Y-%m-%d %H:%M', time.localtime(e['last_used']))
+            print(f"{used}  {e['size']:>9,} 字节  命中 {e['hits']:>3}  {e['engine']}/{e['voice']}  {e['text'][:30]}")
+        print(f"共 {len(entries)} 条")
+    elif args.command == 'evict':
+        removed = _update_index(lambda index: _evict(index, int(args.max_mb * 1024 * 1024)))
+        print(f"✅ 已淘汰 {removed} 条")
+    elif args.command == 'clear':
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        print(f"✅ 已清空: {CACHE_DIR}")
+    else:
+        s = stats()
+        print(f"缓存目录: {CACHE_DIR}")
+        print(f"条目: {s['entries']}，大小: {s['bytes'] / 1024 / 1024:.2f} MB / {s['max_bytes'] / 1024 / 1024:.0f} MB")
+        print(f"命中: {s['hits']}，未命中: {s['misses']}，命中率: {s['hit_rate']:.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+并发 TTS 合成调度
+多句配音并发合成（有并发上限），用令牌桶限制请求速率代替固定 sleep，
+失败自动重试（指数退避），结果始终按输入顺序返回
+
+合成命令可以配置，便于用本地桩命令测试限速效果，例如:
+  python3 tts_scheduler.py --command "sh -c 'sleep 0.2; echo {text} > {output}'" \\
+      --rate 2 --burst 1 --concurrency 4 第一句 第二句 第三句 第四句
+"""
+
+import argparse
+import random
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 默认限速：每秒 1 个请求，允许 2 个突发；最多 3 个并发
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 2
+DEFAULT_CONCURRENCY = 3
+DEFAULT_RETRIES = 3
+
+class TokenBucket:
+    """
+    线程安全的令牌桶：每秒补充 rate 个令牌，最多积攒 capacity 个
+    clock / sleep 可替换，方便在测试中使用假时钟
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """取一个令牌，没有令牌时等待；返回等待的秒数"""
+        total = 0.0
+        while True:
+            with self._lock:
+                self._refill(self.clock())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.waited += total
+                    return total
+                delay = (1 - self.tokens) / self.rate
+            self.sleep(delay)
+            total += delay
+
+_shared_bucket = None
+_shared_lock = threading.Lock()
+
+def shared_bucket(rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+    """进程内共享的令牌桶（多个调用方合成时共用同一个速率限制）"""
+    global _shared_bucket
+    with _shared_lock:
+        if _shared_bucket is None:
+            _shared_bucket = TokenBucket(rate, burst)
+        return _shared_bucket
+
+def command_synthesizer(template, cwd=None, timeout=30):
+    """
+    由命令模板生成合成函数 synth(text, output_file, voice) -> bool
+    模板中的 {text} {output} {voice} {rate} {pitch} 会被替换（每个参数单独替换，不经过 shell）
+    """
+    args = shlex.split(template) if isinstance(template, str) else list(template)
+
+    def synth(text, output_file, voice=None):
+        voice = voice or {}
+        values = {
+            'text': text,
+            'output': str(Path(output_file).absolute()),
+            'voice': voice.get('name', ''),
+            'rate': voice.get('rate', 'default'),
+            'pitch': voice.get('pitch', 'default'),
+        }
+        cmd = [arg.format(**values) for arg in args]
+        result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, timeout=timeout)
+        if result.returncode != 0:
+            print(f"  错误: 退出码 {result.returncode} {result.stderr.strip()[-200:]}")
+        return result.returncode == 0
+    return synth
+
+def synthesize_all(jobs, synth, concurrency=DEFAULT_CONCURRENCY, bucket=None,
+                   retries=DEFAULT_RETRIES, backoff=1.0, voice=None):
+    """
+    并发合成
+
+    jobs: [(文本, 输出文件)]；synth(text, output_file, voice) 返回是否成功
+    每次请求（包括重试）都先从令牌桶取令牌；返回与 jobs 顺序一致的输出路径列表，失败的为 None
+    """
+    bucket = bucket or shared_bucket()
+    workers = max(1, min(concurrency, len(jobs)))
+
+    def run(index, text, output_file):
+        output_file = Path(output_file)
+        start = time.perf_counter()
+        for attempt in range(retries + 1):
+            bucket.acquire()
+            try:
+                ok = synth(text, output_file, voice)
+            except Exception as e:
+                print(f"  异常: {e}")
+                ok = False
+            if ok and output_file.exists() and output_file.stat().st_size > 0:
+                print(f"  ✅ 第 {index} 句: {time.perf_counter() - start:.2f}秒"
+                      + (f"（重试 {attempt} 次）" if attempt else ""))
+                return output_file
+            if attempt < retries:
+                # 指数退避加随机抖动，避免多个失败请求同时重试
+                time.sleep(random.uniform(0, backoff * (2 ** attempt)))
+        print(f"  ❌ 第 {index} 句合成失败: {text[:20]}")
+        return None
+
+    print(f"\n并发合成 {len(jobs)} 句（并发 {workers}，限速 {bucket.rate:g} 次/秒）...")
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run, i, text, output)
+                   for i, (text, output) in enumerate(jobs, 1)]
+        results = [f.result() for f in futures]
+    wall = time.perf_counter() - wall_start
+    print(f"合成完成: {sum(1 for r in results if r)}/{len(jobs)} 句，"
+          f"总耗时 {wall:.2f}秒，限速累计等待 {bucket.waited:.2f}秒")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='并发 TTS 合成（可用桩命令测试限速）')
+    parser.add_argument('texts', nargs='+', help='要合成的句子')
+    parser.add_argument('--command', required=True,
+                        help='合成命令模板，支持 {text} {output} {voice} {rate} {pitch}')
+    parser.add_argument('--output-dir', default=None, help='输出目录（默认临时目录）')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='每秒请求数')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help='允许的突发请求数')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES)
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir or tempfile.mkdtemp(prefix='tts-'))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(text, output_dir / f"sentence_{i}.mp3") for i, text in enumerate(args.texts, 1)]
+    results = synthesize_all(jobs, command_synthesizer(args.command),
+                             concurrency=args.concurrency,
+                             bucket=TokenBucket(args.rate, args.burst),
+                             retries=args.retries)
+    for result in results:
+        print(result or '失败')
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,92 @@
 #!/usr/bin/env python3
-import requests
+import argparse
 import json
 
-def fetch_zhihu_hot():
+import http_cache
+import http_client
+import ndjson_output
+
+JSON_HEADERS = {'Accept': http_client.ACCEPT_JSON}
+
+def fetch_zhihu_hot(timeout=30, retries=None):
     """抓取知乎热榜"""
     url = 'https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total?limit=20&reverse_order=0'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'application/json',
-    }
-    
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
-        if resp.status_code == 200:
-            data = resp.json()
-            return data.get('data', [])
+        return http_cache.fetch(
+            url,
+            lambda resp: resp.json().get('data', []),
+            headers=JSON_HEADERS,
+            timeout=timeout,
+            retries=retries,
+        ) or []
     except Exception as e:
         print(f'知乎错误：{e}')
     return []
 
-def fetch_douyin_hot():
+def fetch_douyin_hot(timeout=30, retries=None):
     """抓取抖音热榜"""
     url = 'https://www.douyin.com/aweme/v1/web/hot/search/list/'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'application/json',
-    }
-    
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
-        if resp.status_code == 200:
-            data = resp.json()
-            return data.get('data', {}).get('word_list', [])
+        return http_cache.fetch(
+            url,
+            lambda resp: resp.json().get('data', {}).get('word_list', []),
+            headers=JSON_HEADERS,
+            timeout=timeout,
+            retries=retries,
+        ) or []
     except Exception as e:
         print(f'抖音错误：{e}')
     return []
 
-def fetch_36kr_hot():
+def fetch_36kr_hot(timeout=30, retries=None):
     """抓取 36 氪热点"""
     url = 'https://36kr.com/api/newsflash?per_page=20'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'application/json',
-    }
-    
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
-        if resp.status_code == 200:
-            data = resp.json()
-            return data.get('data', {}).get('items', [])
+        return http_cache.fetch(
+            url,
+            lambda resp: resp.json().get('data', {}).get('items', []),
+            headers=JSON_HEADERS,
+            timeout=timeout,
+            retries=retries,
+        ) or []
     except Exception as e:
         print(f'36 氪错误：{e}')
     return []
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='知乎/36 氪热点简报')
+    ndjson_output.add_argument(parser)
+    args = parser.parse_args(argv)
+    
+    from hotsearch_collector import collect
+    from hotsearch_history import record_results
+    
+    if args.ndjson:
+        with ndjson_output.writer() as out:
+            results = collect(
+                platforms=('zhihu', '36kr'),
+                on_result=lambda platform, r: out.emit_items(r['items'], platform=platform),
+            )
+            record_results(results)
+        return
+    
     print("=" * 80)
     print("🔥 全网热点热搜简报")
     print("=" * 80)
     print(f"抓取时间：2026-02-19 08:49 UTC")
     print("=" * 80)
     
+    # 知乎、36 氪同时抓取
+    results = collect(platforms=('zhihu', '36kr'))
+    record_results(results)
+    
     # 知乎热榜
     print("\n【知乎热榜 TOP 10】\n")
-    zhihu = fetch_zhihu_hot()
+    zhihu = results.get('zhihu', {}).get('items')
     if zhihu:
         for i, item in enumerate(zhihu[:10], 1):
-            target = item.get('target', {})
-            title = target.get('title', 'N/A')
-            excerpt = target.get('excerpt', '')[:50]
-            print(f"{i}. {title}")
+            excerpt = item['excerpt'][:50]
+            print(f"{i}. {item['title']}")
             if excerpt:
                 print(f"   {excerpt}...")
     else:
@@ -77,11 +95,10 @@ def main():
     # 36 氪快讯
     print("\n" + "=" * 80)
     print("\n【36 氪·24 小时快讯 TOP 10】\n")
-    kr = fetch_36kr_hot()
+    kr = results.get('36kr', {}).get('items')
     if kr:
         for i, item in enumerate(kr[:10], 1):
-            title = item.get('title', 'N/A')
-            print(f"{i}. {title}")
+            print(f"{i}. {item['title']}")
     else:
         print("无法获取 36 氪快讯")
     
@@ -1,45 +1,13 @@
 #!/usr/bin/env python3
-import requests
+import argparse
+
+import http_cache
+import lxml_parsers
+import ndjson_output
 from bs4 import BeautifulSoup
 import re
 
-def fetch_baidu_hotsearch():
-    """抓取百度热搜"""
-    urls = [
-        'https://www.baidu.com',
-        'https://top.baidu.com/board?tab=realtime',
-    ]
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-    }
-    
-    for url in urls:
-        try:
-            resp = requests.get(url, headers=headers, timeout=30)
-            resp.encoding = 'utf-8'
-            if resp.status_code == 200:
-                return resp.text, url
-        except:
-            continue
-    return None, None
-
-def fetch_weibo_hotsearch():
-    """抓取微博热搜（备选）"""
-    url = 'https://s.weibo.com/top/summary'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-    }
-    
-    try:
-        resp = requests.get(url, headers=headers, timeout=30)
-        resp.encoding = 'utf-8'
-        return resp.text, url
-    except Exception as e:
-        print(f'Weibo error: {e}')
-        return None, None
+WEIBO_URL = 'https://s.weibo.com/top/summary'
 
 def parse_baidu(html):
     """解析百度热搜"""
@@ -62,11 +30,14 @@ def parse_baidu(html):
     
     return hot_list[:20]
 
-def parse_weibo(html):
-    """解析微博热搜"""
+def parse_weibo(html, backend=None):
+    """解析微博热搜（backend: bs4 / lxml / auto）"""
     if not html:
         return []
     
+    if lxml_parsers.resolve_backend(backend) == 'lxml':
+        return lxml_parsers.parse_weibo(html)
+    
     soup = BeautifulSoup(html, 'html.parser')
     hot_list = []
     
@@ -89,39 +60,75 @@ def parse_weibo(html):
     
     return hot_list
 
-def main():
+def fetch_weibo_hot_list(timeout=30, retries=None):
+    """抓取并解析微博热搜，页面未变化时返回缓存的解析结果"""
+    return http_cache.fetch(
+        WEIBO_URL,
+        lambda resp: parse_weibo(resp.text),
+        encoding='utf-8',
+        timeout=timeout,
+        retries=retries,
+    ) or []
+
+def fetch_baidu_hot_list(url, timeout=30, retries=None):
+    """抓取并解析单个百度热搜入口，页面未变化时返回缓存的解析结果"""
+    return http_cache.fetch(
+        url,
+        lambda resp: parse_baidu(resp.text),
+        encoding='utf-8',
+        timeout=timeout,
+        retries=retries,
+    ) or []
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='微博/百度热搜简报')
+    ndjson_output.add_argument(parser)
+    args = parser.parse_args(argv)
+    
+    from hotsearch_collector import collect
+    from hotsearch_history import record_results
+    
+    if args.ndjson:
+        # 机器模式：两个平台哪个先返回就先输出哪个
+        with ndjson_output.writer() as out:
+            results = collect(
+                platforms=('weibo', 'baidu'),
+                on_result=lambda platform, r: out.emit_items(r['items'], platform=platform),
+            )
+            record_results(results)
+        return
+    
     print("=" * 80)
     print("🔥 全网热搜热点简报")
     print("=" * 80)
     print(f"抓取时间：2026-02-19 08:49 UTC")
     print("=" * 80)
     
-    # 尝试微博热搜（更可靠）
-    print("\n正在抓取微博热搜...")
-    html, url = fetch_weibo_hotsearch()
+    # 微博与百度两个入口同时抓取，优先展示微博
+    print("\n正在并发抓取微博、百度热搜...")
+    results = collect(platforms=('weibo', 'baidu'))
+    record_results(results)
     
-    if html:
-        hot_list = parse_weibo(html)
-        if hot_list:
-            print(f"\n✅ 微博热搜 TOP {len(hot_list)}\n")
-            for i, item in enumerate(hot_list[:15], 1):
-                hotspot = f" [{item['hotspot']}]" if item['hotspot'] else ""
-                print(f"{i}. {item['title']}{hotspot}")
-            print("\n" + "=" * 80)
-            return
+    weibo = results.get('weibo')
+    if weibo:
+        hot_list = weibo['items']
+        print(f"\n✅ 微博热搜 TOP {len(hot_list)}\n")
+        for i, item in enumerate(hot_list[:15], 1):
+            hotspot = f" [{item['hotspot']}]" if item['hotspot'] else ""
+            print(f"{i}. {item['title']}{hotspot}")
+        print("\n" + "=" * 80)
+        return
     
     # 备选：百度
-    print("\n微博抓取失败，尝试百度...")
-    html, url = fetch_baidu_hotsearch()
-    
-    if html:
-        hot_list = parse_baidu(html)
-        if hot_list:
-            print(f"\n✅ 百度热搜 TOP {len(hot_list)}\n")
-            for i, title in enumerate(hot_list, 1):
-                print(f"{i}. {title}")
-            print("\n" + "=" * 80)
-            return
+    baidu = results.get('baidu')
+    if baidu:
+        hot_list = baidu['items']
+        print(f"\n微博抓取失败，使用百度（{baidu['source']}）")
+        print(f"\n✅ 百度热搜 TOP {len(hot_list)}\n")
+        for i, item in enumerate(hot_list, 1):
+            print(f"{i}. {item['title']}")
+        print("\n" + "=" * 80)
+        return
     
     print("\n❌ 无法获取热搜数据")
     print("=" * 80)
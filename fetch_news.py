@@ -1,33 +1,30 @@
 #!/usr/bin/env python3
-import requests
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import http_cache
+import http_client
+import lxml_parsers
+import ndjson_output
 from bs4 import BeautifulSoup
 import re
 
-def fetch_page(page_num):
-    """抓取东方财富网热点扫描第 N 页"""
+NEWS_HOST = 'finance.eastmoney.com'
+
+def page_url(page_num):
+    """热点扫描第 N 页的地址"""
     if page_num == 1:
-        url = 'https://finance.eastmoney.com/a/crdsm.html'
-    else:
-        url = f'https://finance.eastmoney.com/a/crdsm_{page_num}.html'
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-    }
-    
-    try:
-        resp = requests.get(url, headers=headers, timeout=30)
-        resp.encoding = 'utf-8'
-        return resp.text
-    except Exception as e:
-        print(f'Error fetching page {page_num}: {e}')
-        return None
+        return f'https://{NEWS_HOST}/a/crdsm.html'
+    return f'https://{NEWS_HOST}/a/crdsm_{page_num}.html'
 
-def parse_news(html):
-    """解析 HTML 提取新闻列表"""
+def parse_news(html, backend=None):
+    """解析 HTML 提取新闻列表（backend: bs4 / lxml / auto）"""
     if not html:
         return []
     
+    if lxml_parsers.resolve_backend(backend) == 'lxml':
+        return lxml_parsers.parse_news(html)
+    
     soup = BeautifulSoup(html, 'html.parser')
     news_list = []
     
@@ -58,30 +55,129 @@ def parse_news(html):
     
     return news_list
 
-def main():
-    all_news = []
-    
-    print("正在抓取东方财富网热点扫描前 5 页...\n")
-    
-    for page in range(1, 6):
-        print(f"抓取第 {page} 页...")
-        html = fetch_page(page)
-        if html:
-            news = parse_news(html)
-            print(f"  找到 {len(news)} 条新闻")
-            all_news.extend(news)
-        else:
-            print(f"  第 {page} 页抓取失败")
-    
-    print(f"\n总共抓取到 {len(all_news)} 条新闻\n")
+def fetch_and_parse(page_num, timeout=30, backend=None):
+    """抓取并解析单页（在工作线程中执行），页面未变化时直接返回缓存的解析结果"""
+    try:
+        return http_cache.fetch(
+            page_url(page_num),
+            lambda resp: parse_news(resp.text, backend=backend),
+            encoding='utf-8',
+            timeout=timeout,
+        )
+    except Exception as e:
+        print(f'Error fetching page {page_num}: {e}')
+        return None
+
+def crawl(max_pages=5, concurrency=None, timeout=30, on_page=None, backend=None):
+    """
+    流水线式并发抓取前 max_pages 页
+    
+    最多 concurrency 个页面同时在途（默认 max_pages，全部页面同时发出，总耗时约等于抓取一页）；
+    结果按页码顺序边到边去重，某一页没有带来任何新 URL 时提前停止：
+    还在排队的页面取消，已在途页面的结果丢弃。
+    concurrency 小于 max_pages 时提前停止能省下尚未发出的请求，代价是多出几轮页面往返的耗时。
+    on_page(page_num, news, new_news) 在每页处理完后回调。
+    返回 (去重后的新闻列表, 抓取到的新闻总数, 实际处理的页数)
+    """
+    concurrency = max(1, concurrency or max_pages)
+    http_client.get_client().set_host_limit(NEWS_HOST, concurrency)
     
-    # 去重
     seen = set()
     unique_news = []
-    for n in all_news:
-        if n['url'] not in seen:
-            seen.add(n['url'])
-            unique_news.append(n)
+    total = 0
+    processed = 0
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {}
+        next_page = 1
+        
+        def fill_window():
+            nonlocal next_page
+            while next_page <= max_pages and len(futures) < concurrency:
+                futures[next_page] = executor.submit(fetch_and_parse, next_page, timeout, backend)
+                next_page += 1
+        
+        fill_window()
+        page = 1
+        while page in futures:
+            news = futures.pop(page).result()
+            processed = page
+            
+            new_news = []
+            if news is not None:
+                total += len(news)
+                for n in news:
+                    if n['url'] not in seen:
+                        seen.add(n['url'])
+                        new_news.append(n)
+                unique_news.extend(new_news)
+            
+            if on_page:
+                on_page(page, news, new_news)
+            
+            # 抓取成功但没有新内容：后面的页面只会更旧或重复
+            if news is not None and not new_news:
+                for future in futures.values():
+                    future.cancel()
+                break
+            
+            fill_window()
+            page += 1
+    
+    return unique_news, total, processed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='东方财富网热点扫描新闻简报')
+    parser.add_argument('--pages', type=int, default=5, help='最多抓取的页数（默认 5）')
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help='同时在途的页面数（默认等于页数，全部同时抓取；'
+                             '设得更小时提前停止能少发请求，但要多等几轮页面往返）')
+    parser.add_argument('--timeout', type=float, default=30, help='单页超时秒数（默认 30）')
+    parser.add_argument('--parser', choices=('auto',) + lxml_parsers.BACKENDS, default='auto',
+                        help='HTML 解析后端（默认 auto：有 lxml 时用 lxml）')
+    ndjson_output.add_argument(parser)
+    return parser.parse_args(argv)
+
+def main_ndjson(args):
+    """机器模式：每页去重后的新条目立即逐行输出"""
+    with ndjson_output.writer() as out:
+        def emit_page(page, news, new_news):
+            for n in new_news:
+                out.emit({'source': 'eastmoney', 'page': page, **n})
+        
+        unique_news, _, _ = crawl(
+            max_pages=args.pages,
+            concurrency=args.concurrency,
+            timeout=args.timeout,
+            on_page=emit_page,
+            backend=args.parser,
+        )
+    return unique_news
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.ndjson:
+        return main_ndjson(args)
+    
+    print(f"正在抓取东方财富网热点扫描前 {args.pages} 页...\n")
+    
+    def report(page, news, new_news):
+        if news is None:
+            print(f"  第 {page} 页抓取失败")
+        else:
+            print(f"第 {page} 页：找到 {len(news)} 条新闻，新增 {len(new_news)} 条")
+            if not new_news:
+                print("  没有新内容，提前停止")
+    
+    unique_news, total, pages = crawl(
+        max_pages=args.pages,
+        concurrency=args.concurrency,
+        timeout=args.timeout,
+        on_page=report,
+        backend=args.parser,
+    )
+    
+    print(f"\n总共抓取到 {total} 条新闻\n")
     
     print(f"去重后 {len(unique_news)} 条新闻\n")
     
@@ -91,7 +187,7 @@ def main():
     print("=" * 80)
     print(f"来源：东方财富网 - 热点扫描")
     print(f"抓取时间：2026-02-19")
-    print(f"页数：前 5 页")
+    print(f"页数：前 {pages} 页")
     print(f"新闻数量：{len(unique_news)} 条")
     print("=" * 80)
     
@@ -103,6 +199,10 @@ def main():
     
     print("\n" + "=" * 80)
     
+    # 连接复用情况（5 个页面应共用同一个 TLS 会话）
+    http_client.print_stats()
+    http_cache.print_stats()
+    
     return unique_news
 
 if __name__ == '__main__':
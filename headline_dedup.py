@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+跨来源近似重复标题聚类
+标题按字符 n-gram 切片（适合中文，无需分词），计算 MinHash 签名，
+用 LSH 分桶只比较同桶候选对，聚类复杂度随条目数近似线性增长；
+输出每个事件一个簇，附带出现过的来源列表
+
+用法:
+  python3 fetch_news.py --ndjson | python3 headline_dedup.py
+  （从 stdin 读取带 title 字段的 NDJSON 行，输出每簇一行 JSON）
+"""
+import hashlib
+import json
+import random
+import sys
+import unicodedata
+from collections import defaultdict
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+def normalize(title):
+    """全角转半角、转小写，只保留文字和数字"""
+    text = unicodedata.normalize('NFKC', title).lower()
+    return ''.join(ch for ch in text if unicodedata.category(ch)[0] in 'LN')
+
+def shingles(text, n=2):
+    """字符 n-gram 集合；不足 n 个字符时整体作为一个切片"""
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def _shingle_hash(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'big')
+
+class MinHasher:
+    """num_perm 个 (a*x + b) mod p 置换的 MinHash"""
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.perms = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingle_set):
+        if not shingle_set:
+            return (MAX_HASH,) * self.num_perm
+        hashes = [_shingle_hash(s) for s in shingle_set]
+        return tuple(
+            min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes)
+            for a, b in self.perms
+        )
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+def cluster_headlines(items, threshold=0.5, n=2, bands=16, rows=4, seed=1):
+    """
+    把 [{'title', 'platform', ...}] 聚成事件簇
+
+    bands * rows 个 MinHash 值分成 bands 段，任一段完全相同的两条进入候选，
+    候选对再用切片集合的精确 Jaccard 相似度确认（>= threshold 才合并）。
+    返回按来源数、最靠前排名排序的簇列表：
+    [{'title': 代表标题, 'sources': [...], 'items': [...]}]
+    """
+    hasher = MinHasher(num_perm=bands * rows, seed=seed)
+    shingle_sets = [shingles(normalize(item['title']), n) for item in items]
+    uf = _UnionFind(len(items))
+
+    buckets = defaultdict(list)
+    for idx, sset in enumerate(shingle_sets):
+        if not sset:
+            continue
+        sig = hasher.signature(sset)
+        for band in range(bands):
+            buckets[(band, sig[band * rows:(band + 1) * rows])].append(idx)
+
+    checked = set()
+    for members in buckets.values():
+        for i in range(1, len(members)):
+            for j in range(i):
+                a, b = members[j], members[i]
+                if (a, b) in checked:
+                    continue
+                checked.add((a, b))
+                if jaccard(shingle_sets[a], shingle_sets[b]) >= threshold:
+                    uf.union(a, b)
+
+    groups = defaultdict(list)
+    for idx in range(len(items)):
+        groups[uf.find(idx)].append(items[idx])
+
+    clusters = []
+    for members in groups.values():
+        members.sort(key=lambda item: item.get('rank', 0))
+        sources = []
+        for item in members:
+            source = item.get('platform') or item.get('source') or ''
+            if source not in sources:
+                sources.append(source)
+        clusters.append({'title': members[0]['title'], 'sources': sources, 'items': members})
+
+    clusters.sort(key=lambda c: (-len(c['sources']), c['items'][0].get('rank', 0)))
+    return clusters
+
+def main():
+    items = []
+    for line in sys.stdin:
+        line = line.strip()
+        if line:
+            record = json.loads(line)
+            if record.get('title'):
+                items.append(record)
+
+    for cluster in cluster_headlines(items):
+        print(json.dumps(cluster, ensure_ascii=False))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+并发热搜采集器
+同时抓取微博、百度（两个入口）、知乎、抖音、36 氪，每个来源有独立的截止时间，
+每个平台取第一个成功返回的结果，总耗时只受最慢的截止时间约束。
+来源只请求一次、不重试（重试会让实际耗时成倍超出截止时间），
+并在守护线程中执行，挂起的连接不会拖住采集结果的返回和进程退出
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+
+import fetch_hotsearch
+import fetch_all_hotsearch
+import http_cache
+import http_client
+import headline_dedup
+import hotsearch_history
+import ndjson_output
+
+PLATFORM_NAMES = {
+    'weibo': '微博热搜',
+    'baidu': '百度热搜',
+    'zhihu': '知乎热榜',
+    'douyin': '抖音热榜',
+    '36kr': '36 氪快讯',
+}
+
+def _weibo(timeout):
+    return fetch_hotsearch.fetch_weibo_hot_list(timeout=timeout, retries=0)
+
+def _baidu(url):
+    def fetch(timeout):
+        titles = fetch_hotsearch.fetch_baidu_hot_list(url, timeout=timeout, retries=0)
+        return [{'title': title} for title in titles]
+    return fetch
+
+def _zhihu(timeout):
+    items = []
+    for item in fetch_all_hotsearch.fetch_zhihu_hot(timeout=timeout, retries=0):
+        target = item.get('target', {})
+        items.append({
+            'title': target.get('title', 'N/A'),
+            'excerpt': target.get('excerpt', ''),
+        })
+    return items
+
+def _douyin(timeout):
+    return [
+        {'title': item.get('word', 'N/A'), 'hot_value': item.get('hot_value', '')}
+        for item in fetch_all_hotsearch.fetch_douyin_hot(timeout=timeout, retries=0)
+    ]
+
+def _36kr(timeout):
+    return [
+        {'title': item.get('title', 'N/A')}
+        for item in fetch_all_hotsearch.fetch_36kr_hot(timeout=timeout, retries=0)
+    ]
+
+# (平台, 来源名, 抓取函数, 截止时间秒)
+# 同一平台的多个来源同时发出，先成功者胜出
+SOURCES = [
+    ('weibo', 's.weibo.com', _weibo, 10),
+    ('baidu', 'top.baidu.com', _baidu('https://top.baidu.com/board?tab=realtime'), 8),
+    ('baidu', 'www.baidu.com', _baidu('https://www.baidu.com'), 8),
+    ('zhihu', 'zhihu.com', _zhihu, 10),
+    ('douyin', 'douyin.com', _douyin, 10),
+    ('36kr', '36kr.com', _36kr, 10),
+]
+
+def _run_source(fetch, deadline):
+    """在工作线程中执行单个来源，异常视为失败"""
+    start = time.monotonic()
+    try:
+        items = fetch(deadline)
+    except Exception as e:
+        return [], time.monotonic() - start, e
+    return items or [], time.monotonic() - start, None
+
+def _submit(fetch, deadline):
+    """
+    在守护线程中执行来源，返回 Future
+    不用线程池：解释器退出时会等待线程池的工作线程，挂起的请求会拖过截止时间
+    """
+    future = Future()
+
+    def run():
+        future.set_result(_run_source(fetch, deadline))
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+def collect(platforms=None, sources=None, on_result=None):
+    """
+    并发抓取各来源，返回 {平台: {'items', 'source', 'elapsed'}}
+
+    每个来源的截止时间同时作为 requests 的超时，且不重试；超过截止时间的结果被丢弃，
+    最迟在最大截止时间到达时返回。某个平台已有结果后，同平台的其他来源不再等待。
+    on_result(platform, result) 在每个平台首次成功时立即回调。
+    """
+    sources = [s for s in (sources or SOURCES) if platforms is None or s[0] in platforms]
+    results = {}
+    if not sources:
+        return results
+
+    start = time.monotonic()
+    futures = {_submit(s[2], s[3]): s for s in sources}
+    pending = set(futures)
+
+    while pending:
+        elapsed = time.monotonic() - start
+        pending = {
+            f for f in pending
+            if futures[f][0] not in results and elapsed < futures[f][3]
+        }
+        if not pending:
+            break
+
+        # 最早到期的截止时间唤醒一次，以便丢弃已超时的来源
+        timeout = min(futures[f][3] for f in pending) - elapsed
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        for f in done:
+            platform, name, _, deadline = futures[f]
+            items, took, error = f.result()
+            if platform in results or took > deadline:
+                continue
+            if error is not None:
+                print(f'{name} 错误：{error}')
+                continue
+            if items:
+                results[platform] = {'items': items, 'source': name, 'elapsed': took}
+                if on_result:
+                    on_result(platform, results[platform])
+
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='全网热搜并发采集')
+    ndjson_output.add_argument(parser)
+    args = parser.parse_args(argv)
+
+    if args.ndjson:
+        # 机器模式：每个平台一返回就逐条输出
+        with ndjson_output.writer() as out:
+            results = collect(
+                on_result=lambda platform, r: out.emit_items(r['items'], platform=platform),
+            )
+            hotsearch_history.record_results(results)
+        return
+
+    print("=" * 80)
+    print("🔥 全网热搜热点简报")
+    print("=" * 80)
+
+    start = time.monotonic()
+    results = collect()
+    hotsearch_history.record_results(results)
+
+    history = hotsearch_history.HotSearchHistory()
+    for platform, title in PLATFORM_NAMES.items():
+        print(f"\n【{title}】\n")
+        result = results.get(platform)
+        if not result:
+            print(f"无法获取{title}")
+            continue
+        # 与 24 小时内最早排名对比
+        changes = {t: c for _, t, c in history.rank_changes(platform, hours=24)}
+        for i, item in enumerate(result['items'][:10], 1):
+            change = hotsearch_history.format_change(changes.get(item['title'].strip()))
+            print(f"{i}. {item['title']} [{change}]")
+        print(f"\n（来源：{result['source']}，耗时 {result['elapsed']:.1f} 秒）")
+
+    history.close()
+
+    # 同一事件在多个平台以不同标题出现时合并展示
+    combined = [
+        {'platform': PLATFORM_NAMES[platform], 'rank': rank, 'title': item['title']}
+        for platform, result in results.items()
+        for rank, item in enumerate(result['items'], 1)
+    ]
+    clusters = [c for c in headline_dedup.cluster_headlines(combined) if len(c['sources']) > 1]
+    if clusters:
+        print("\n【跨平台热点】\n")
+        for i, cluster in enumerate(clusters, 1):
+            print(f"{i}. {cluster['title']}（{'、'.join(cluster['sources'])}）")
+
+    print("\n" + "=" * 80)
+    print(f"总耗时：{time.monotonic() - start:.1f} 秒")
+    http_client.print_stats()
+    http_cache.print_stats()
+    print("=" * 80)
+
+if __name__ == '__main__':
+    main()
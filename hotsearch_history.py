@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+热搜历史库（SQLite）
+每次抓取的榜单按 (平台, 标题哈希, 时间戳) 追加写入，同时维护每个标题的
+首次/最近上榜时间，查询"新上榜"、"N 小时排名变化"、"在榜时长"时只走索引，不回扫旧快照
+
+用法:
+  python3 hotsearch_history.py new weibo
+  python3 hotsearch_history.py rank weibo --hours 6
+  python3 hotsearch_history.py time weibo
+"""
+import argparse
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+DB_PATH = Path(__file__).parent / 'data' / 'hotsearch_history.sqlite3'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    platform TEXT NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_platform_ts ON runs (platform, ts);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    platform TEXT NOT NULL,
+    title_hash INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (platform, title_hash, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS titles (
+    platform TEXT NOT NULL,
+    title_hash INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_rank INTEGER NOT NULL,
+    PRIMARY KEY (platform, title_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS titles_last_seen ON titles (platform, last_seen);
+"""
+
+def title_hash(title):
+    """标题的 64 位有符号哈希（SQLite INTEGER 范围内）"""
+    digest = hashlib.blake2b(title.strip().encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+class HotSearchHistory:
+    """热搜历史库"""
+
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, platform, items, ts=None):
+        """追加一次榜单快照，items 为按排名排列的 {'title': ...} 列表"""
+        ts = time.time() if ts is None else ts
+        with self.conn:
+            self.conn.execute('INSERT INTO runs (platform, ts) VALUES (?, ?)', (platform, ts))
+            seen = set()
+            for rank, item in enumerate(items, 1):
+                title = item['title'].strip()
+                h = title_hash(title)
+                if not title or h in seen:
+                    continue
+                seen.add(h)
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO snapshots (platform, title_hash, ts, rank) VALUES (?, ?, ?, ?)',
+                    (platform, h, ts, rank),
+                )
+                self.conn.execute(
+                    """
+                    INSERT INTO titles (platform, title_hash, title, first_seen, last_seen, last_rank)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (platform, title_hash)
+                    DO UPDATE SET last_seen = excluded.last_seen, last_rank = excluded.last_rank
+                    """,
+                    (platform, h, title, ts, ts, rank),
+                )
+        return ts
+
+    def _last_runs(self, platform, n=2):
+        rows = self.conn.execute(
+            'SELECT ts FROM runs WHERE platform = ? ORDER BY ts DESC LIMIT ?', (platform, n)
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def new_since_last_run(self, platform):
+        """最近一次抓取中首次出现的条目 [(排名, 标题)]"""
+        runs = self._last_runs(platform, 1)
+        if not runs:
+            return []
+        return self.conn.execute(
+            """
+            SELECT last_rank, title FROM titles
+            WHERE platform = ? AND last_seen = ? AND first_seen = ?
+            ORDER BY last_rank
+            """,
+            (platform, runs[0], runs[0]),
+        ).fetchall()
+
+    def rank_changes(self, platform, hours):
+        """
+        当前榜单各条目相对 hours 小时窗口内最早排名的变化
+        返回 [(当前排名, 标题, 变化)]，变化为正表示上升，None 表示窗口内新上榜
+        """
+        runs = self._last_runs(platform, 1)
+        if not runs:
+            return []
+        since = runs[0] - hours * 3600
+        rows = self.conn.execute(
+            """
+            SELECT t.last_rank, t.title,
+                   (SELECT s.rank FROM snapshots s
+                    WHERE s.platform = t.platform AND s.title_hash = t.title_hash
+                      AND s.ts >= ? AND s.ts < t.last_seen
+                    ORDER BY s.ts LIMIT 1) AS old_rank
+            FROM titles t
+            WHERE t.platform = ? AND t.last_seen = ?
+            ORDER BY t.last_rank
+            """,
+            (since, platform, runs[0]),
+        ).fetchall()
+        return [(rank, title, None if old is None else old - rank) for rank, title, old in rows]
+
+    def time_on_list(self, platform):
+        """当前榜单各条目自首次上榜以来的时长 [(当前排名, 标题, 秒数)]"""
+        runs = self._last_runs(platform, 1)
+        if not runs:
+            return []
+        return self.conn.execute(
+            """
+            SELECT last_rank, title, last_seen - first_seen FROM titles
+            WHERE platform = ? AND last_seen = ?
+            ORDER BY last_rank
+            """,
+            (platform, runs[0]),
+        ).fetchall()
+
+def record_results(results, path=DB_PATH):
+    """把 hotsearch_collector.collect() 的结果写入历史库"""
+    history = HotSearchHistory(path)
+    try:
+        ts = time.time()
+        for platform, result in results.items():
+            history.record(platform, result['items'], ts=ts)
+    finally:
+        history.close()
+
+def format_change(change):
+    if change is None:
+        return '新'
+    if change > 0:
+        return f'↑{change}'
+    if change < 0:
+        return f'↓{-change}'
+    return '-'
+
+def main():
+    parser = argparse.ArgumentParser(description='热搜历史查询')
+    parser.add_argument('query', choices=('new', 'rank', 'time'))
+    parser.add_argument('platform', help='weibo / baidu / zhihu / douyin / 36kr')
+    parser.add_argument('--hours', type=float, default=24, help='排名变化的时间窗口（默认 24 小时）')
+    parser.add_argument('--db', default=str(DB_PATH))
+    args = parser.parse_args()
+
+    history = HotSearchHistory(args.db)
+    start = time.perf_counter()
+    if args.query == 'new':
+        rows = history.new_since_last_run(args.platform)
+        for rank, title in rows:
+            print(f"{rank}. {title}")
+    elif args.query == 'rank':
+        rows = history.rank_changes(args.platform, args.hours)
+        for rank, title, change in rows:
+            print(f"{rank}. {title} [{format_change(change)}]")
+    else:
+        rows = history.time_on_list(args.platform)
+        for rank, title, seconds in rows:
+            print(f"{rank}. {title} （在榜 {seconds / 3600:.1f} 小时）")
+    elapsed = (time.perf_counter() - start) * 1000
+    history.close()
+
+    if not rows:
+        print("没有数据")
+    print(f"\n查询耗时 {elapsed:.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+按 URL 缓存的条件请求缓存
+保存 ETag / Last-Modified、响应体哈希和解析结果快照：
+- TTL 内直接返回解析结果，不发请求
+- 过期后发送条件请求，304 或响应体未变化时返回缓存的解析结果，不再重新解析
+- 总大小超过上限时按最近使用时间淘汰
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import http_client
+
+CACHE_DIR = Path(__file__).parent / '.cache' / 'http'
+DEFAULT_TTL = 120
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+class HttpCache:
+    """磁盘 HTTP 缓存，每个 URL 一个 JSON 文件"""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.counters = {'fresh': 0, 'not_modified': 0, 'unchanged': 0, 'miss': 0}
+
+    def _path(self, url):
+        return self.cache_dir / (hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _load(self, url):
+        path = self._path(url)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def _save(self, url, entry):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        tmp = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _touch(self, url):
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def _count(self, key):
+        with self._lock:
+            self.counters[key] += 1
+
+    def _evict(self):
+        """总大小超过 max_bytes 时删除最久未使用的条目"""
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.cache_dir.glob('*.json'):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+    def fetch(self, url, parse, headers=None, timeout=30, encoding=None, ttl=None, retries=None):
+        """
+        获取 url 的解析结果
+
+        parse(response) 只在缓存未命中时调用，返回值必须可 JSON 序列化。
+        非 200/304 响应不缓存，返回 None；网络异常照常抛出。
+        retries 为 None 时使用共享客户端的默认重试次数。
+        """
+        ttl = self.ttl if ttl is None else ttl
+        entry = self._load(url)
+        now = time.time()
+
+        if entry and now - entry['fetched_at'] < ttl:
+            self._count('fresh')
+            self._touch(url)
+            return entry['parsed']
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        resp = http_client.get(url, headers=request_headers, timeout=timeout, retries=retries)
+
+        if resp.status_code == 304 and entry:
+            self._count('not_modified')
+            entry['fetched_at'] = now
+            self._save(url, entry)
+            return entry['parsed']
+
+        if resp.status_code != 200:
+            return None
+
+        body_hash = hashlib.sha256(resp.content).hexdigest()
+        validators = {
+            'etag': resp.headers.get('ETag'),
+            'last_modified': resp.headers.get('Last-Modified'),
+        }
+
+        if entry and entry.get('body_hash') == body_hash:
+            self._count('unchanged')
+            entry.update(validators, fetched_at=now)
+            self._save(url, entry)
+            return entry['parsed']
+
+        if encoding:
+            resp.encoding = encoding
+        parsed = parse(resp)
+        self._count('miss')
+        self._save(url, {
+            'url': url,
+            'fetched_at': now,
+            'body_hash': body_hash,
+            'parsed': parsed,
+            **validators,
+        })
+        return parsed
+
+    def disk_usage(self):
+        """返回 (条目数, 总字节数)"""
+        sizes = [p.stat().st_size for p in self.cache_dir.glob('*.json')]
+        return len(sizes), sum(sizes)
+
+    def clear(self):
+        for path in self.cache_dir.glob('*.json'):
+            path.unlink(missing_ok=True)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """返回进程内共享的缓存"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
+
+def fetch(url, parse, **kwargs):
+    """使用共享缓存获取 url 的解析结果"""
+    return get_cache().fetch(url, parse, **kwargs)
+
+def print_stats():
+    """打印本次运行的命中/未命中计数"""
+    c = get_cache().counters
+    hits = c['fresh'] + c['not_modified'] + c['unchanged']
+    print(f"HTTP 缓存：命中 {hits} 次（TTL 内 {c['fresh']}，304 {c['not_modified']}，"
+          f"内容未变 {c['unchanged']}），未命中 {c['miss']} 次")
+
+def main():
+    cache = get_cache()
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    if command == 'clear':
+        cache.clear()
+        print(f"已清空缓存: {cache.cache_dir}")
+    else:
+        count, size = cache.disk_usage() if cache.cache_dir.exists() else (0, 0)
+        print(f"缓存目录: {cache.cache_dir}")
+        print(f"条目数: {count}")
+        print(f"占用: {size / 1024:.1f} KB / {cache.max_bytes / 1024 / 1024:.0f} MB")
+
+if __name__ == '__main__':
+    main()
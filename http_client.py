@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+共享 HTTP 客户端
+所有抓取脚本共用一个 requests.Session：按主机保持 keep-alive 连接池，
+按主机限制并发，失败时指数退避加随机抖动重试，并统计连接复用次数
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+ACCEPT_HTML = 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
+ACCEPT_JSON = 'application/json'
+
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': ACCEPT_HTML,
+}
+
+# 需要重试的状态码
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class HttpClient:
+    """带连接池、按主机并发限制和退避重试的 HTTP 客户端"""
+
+    def __init__(self, pool_maxsize=10, default_host_limit=4, host_limits=None,
+                 retries=2, backoff=0.5, max_backoff=8.0):
+        self.default_host_limit = default_host_limit
+        self.host_limits = dict(host_limits or {})
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        # 重试由本类负责（带抖动），连接池本身不重试
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._retries = defaultdict(int)
+
+    def set_host_limit(self, host, limit):
+        """设置某个主机的最大并发请求数（需在首次请求该主机前设置）"""
+        with self._lock:
+            self.host_limits[host] = limit
+            self._semaphores.pop(host, None)
+
+    def _semaphore(self, host):
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                limit = self.host_limits.get(host, self.default_host_limit)
+                sem = self._semaphores[host] = threading.BoundedSemaphore(limit)
+            return sem
+
+    def _sleep_before_retry(self, attempt, resp=None):
+        """指数退避 + 全抖动；服务器给出 Retry-After 时优先使用"""
+        delay = None
+        if resp is not None:
+            retry_after = resp.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = min(float(retry_after), self.max_backoff)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        time.sleep(delay)
+
+    def request(self, method, url, retries=None, **kwargs):
+        """发送请求，连接错误、超时和 RETRY_STATUS 状态码会重试"""
+        retries = self.retries if retries is None else retries
+        host = urlsplit(url).hostname or ''
+        sem = self._semaphore(host)
+
+        for attempt in range(retries + 1):
+            try:
+                with sem:
+                    resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= retries:
+                    raise
+                self._retries[host] += 1
+                self._sleep_before_retry(attempt)
+                continue
+
+            if resp.status_code in RETRY_STATUS and attempt < retries:
+                resp.close()
+                self._retries[host] += 1
+                self._sleep_before_retry(attempt, resp)
+                continue
+            return resp
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def stats(self):
+        """按主机返回 {请求数, 新建连接数, 复用次数, 重试次数}"""
+        result = {}
+        adapter = self.session.get_adapter('https://')
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_made = getattr(pool, 'num_requests', 0)
+            connections = getattr(pool, 'num_connections', 0)
+            result[pool.host] = {
+                'requests': requests_made,
+                'connections': connections,
+                'reused': max(requests_made - connections, 0),
+                'retries': self._retries.get(pool.host, 0),
+            }
+        return result
+
+    def close(self):
+        self.session.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """返回进程内共享的客户端"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+def get(url, **kwargs):
+    """使用共享客户端发送 GET 请求"""
+    return get_client().get(url, **kwargs)
+
+def print_stats():
+    """打印连接复用统计"""
+    for host, s in sorted(get_client().stats().items()):
+        print(f"{host}: 请求 {s['requests']} 次，新建连接 {s['connections']} 个，"
+              f"复用 {s['reused']} 次，重试 {s['retries']} 次")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+基于 lxml 的快速解析后端
+与 fetch_news.parse_news / fetch_hotsearch.parse_weibo 的 BeautifulSoup 版本返回相同结构，
+XPath 表达式在导入时预编译，避免逐节点执行 Python lambda 匹配
+"""
+import os
+
+try:
+    from lxml import etree, html as lxml_html
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
+BACKENDS = ('bs4', 'lxml')
+
+def resolve_backend(backend=None):
+    """
+    确定解析后端：显式参数 > 环境变量 SCRAPER_PARSER > 自动（有 lxml 用 lxml）
+    """
+    backend = backend or os.environ.get('SCRAPER_PARSER') or 'auto'
+    if backend == 'auto':
+        return 'lxml' if HAVE_LXML else 'bs4'
+    if backend not in BACKENDS:
+        raise ValueError(f'未知解析后端: {backend}')
+    if backend == 'lxml' and not HAVE_LXML:
+        raise RuntimeError('lxml 未安装，请使用 --parser bs4')
+    return backend
+
+def _has_class(name):
+    """XPath 条件：class 属性包含完整的 name 类名"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+if HAVE_LXML:
+    _UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    _LOWER = 'abcdefghijklmnopqrstuvwxyz'
+
+    NEWS_LIST_DIVS = etree.XPath(f"//div[{_has_class('newslist')}]")
+    NEWS_LIST_ULS = etree.XPath(f"//ul[{_has_class('newslist')}]")
+    NEWS_FALLBACK_DIVS = etree.XPath(
+        f"//div[contains(translate(@class, '{_UPPER}', '{_LOWER}'), 'news')]"
+    )
+    LINKS = etree.XPath('.//a[@href]')
+    TEXT = etree.XPath('.//text()')
+    LI_TIME = etree.XPath(f"(ancestor::li[1]//span[{_has_class('time')}])[1]")
+
+    WEIBO_TABLE = etree.XPath(f"(//table[{_has_class('tab-list')}])[1]")
+    ROWS = etree.XPath('.//tr')
+    WEIBO_TD = etree.XPath(f"(.//td[{_has_class('td-02')}])[1]")
+    FIRST_LINK = etree.XPath('(.//a)[1]')
+    WEIBO_ICON = etree.XPath(f"(.//span[{_has_class('icon-wrap')}])[1]")
+
+def _parse_document(html):
+    # 按字节解析，避免带 encoding 声明的 str 被 lxml 拒绝
+    parser = lxml_html.HTMLParser(encoding='utf-8')
+    return lxml_html.document_fromstring(html.encode('utf-8'), parser=parser)
+
+def _text(element):
+    """等价于 BeautifulSoup 的 get_text(strip=True)"""
+    return ''.join(s.strip() for s in TEXT(element))
+
+def parse_news(html):
+    """lxml 版 fetch_news.parse_news"""
+    if not html:
+        return []
+
+    doc = _parse_document(html)
+    news_list = []
+
+    containers = NEWS_LIST_DIVS(doc) or NEWS_LIST_ULS(doc)
+    if not containers:
+        containers = NEWS_FALLBACK_DIVS(doc)
+
+    for container in containers:
+        for link in LINKS(container):
+            title = _text(link)
+            href = link.get('href')
+            if title and len(title) > 5 and 'eastmoney' in href:
+                time_elems = LI_TIME(link)
+                news_list.append({
+                    'title': title,
+                    'url': href,
+                    'time': _text(time_elems[0]) if time_elems else '',
+                })
+
+    return news_list
+
+def parse_weibo(html):
+    """lxml 版 fetch_hotsearch.parse_weibo"""
+    if not html:
+        return []
+
+    doc = _parse_document(html)
+    hot_list = []
+
+    tables = WEIBO_TABLE(doc)
+    if tables:
+        for row in ROWS(tables[0]):
+            tds = WEIBO_TD(row)
+            if not tds:
+                continue
+            links = FIRST_LINK(tds[0])
+            if not links:
+                continue
+            hotspot = WEIBO_ICON(row)
+            hot_list.append({
+                'title': _text(links[0]),
+                'hotspot': _text(hotspot[0]) if hotspot else '',
+            })
+
+    return hot_list
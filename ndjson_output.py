@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+NDJSON 流式输出
+抓取脚本的机器模式：每解析出一条就向 stdout 写一行 JSON 并立即 flush，
+下游步骤无需等待抓取结束；期间其他 print() 输出转到 stderr，保证 stdout 只有 JSON 行
+"""
+import contextlib
+import json
+import sys
+import threading
+
+def add_argument(parser):
+    """为脚本添加 --ndjson 开关"""
+    parser.add_argument('--ndjson', action='store_true',
+                        help='机器模式：每条结果输出一行 JSON，不打印装饰性标题')
+
+class NDJSONWriter:
+    """线程安全的逐行 JSON 写入器"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+            self.count += 1
+
+    def emit_items(self, items, **fields):
+        """逐条输出列表，附加 rank（从 1 开始）和公共字段"""
+        for rank, item in enumerate(items, 1):
+            self.emit({**fields, 'rank': rank, **item})
+
+@contextlib.contextmanager
+def writer():
+    """进入机器模式：返回写入真实 stdout 的 writer，其余 print 输出改到 stderr"""
+    out = NDJSONWriter(sys.stdout)
+    with contextlib.redirect_stdout(sys.stderr):
+        yield out
@@ -1,111 +1,182 @@
 #!/usr/bin/env python3
+"""
+Parse ClawHub skill list texts and keep the top K by stars.
+
+Usage:
+  python3 parse_skills.py < skills.json                    # read everything, JSON output
+  python3 parse_skills.py --stream --top 20 --format csv < dump.json
+"""
+import argparse
+import ast
+import heapq
+import json
 import re
 import sys
-import json
 from pathlib import Path
 
+# Example: "Gog/gogGoogle Workspace CLI for Gmail, Calendar, Drive, Contacts, Sheets, and Docs.by@steipete 30.6k★ 2051 v"
+# Pattern: name/slugDescriptionby@author downloads★ stars version
+# Some have newlines, extra spaces missing due to CSS ("by@steipete30.6k★2051v")
+SKILL_RE = re.compile(
+    r'(?P<name>[^/]*)/'
+    r'(?P<slug>[a-z0-9\-]*)'            # slug: lowercase letters, digits, hyphens
+    r'(?P<desc>.*?)by@'                 # description runs up to the first "by@"
+    r'(?:(?P<author>.*?)\s*'            # shortest author followed by the stats
+    r'(?P<downloads>[\d.]+[kKmM]?)\s*★\s*(?P<stars>\d+)'
+    r'(?:\s*(?P<version>\d+))?(?P<v>\s*v)?'
+    r'|\s*(?P<bare_author>\S*))',       # no stats: just the author
+    re.S,
+)
+
+CSV_HEADER = ['排名', 'Skill名称', 'Skill描述']
+
 # Input: JSON array of skill texts from stdin
 def parse_skill_text(text):
-    # Example: "Gog/gogGoogle Workspace CLI for Gmail, Calendar, Drive, Contacts, Sheets, and Docs.by@steipete 30.6k★ 2051 v"
-    # Some have newlines, extra spaces missing due to CSS
-    # Try to extract parts
-    # Find the first slash to separate name/slug
-    if '/' not in text:
-        return None
-    # Split by '/' but name may contain spaces
-    # Actually pattern: name/slugDescriptionby@author downloads★ stars version
-    # Use regex
-    # Regex pattern: (.*?)/(.*?)(by@[^\s]+)?\s*([\d\.]+[kK]?)\s*★\s*(\d+)\s*(\d+)\s*v\s*$
-    # But description is between slug and "by@"
-    # Let's try simpler: split by 'by@'
-    parts_by = text.split('by@')
-    if len(parts_by) < 2:
-        return None
-    before_by = parts_by[0]
-    after_by = parts_by[1]
-    # before_by: name/slugDescription
-    # Extract name and slug
-    if '/' not in before_by:
+    match = SKILL_RE.match(text)
+    if not match:
         return None
-    name_slug, description = before_by.split('/', 1)
-    name = name_slug.strip()
-    # slug is up to next capital letter or end
-    # Slug is alphanumeric with hyphens, but here it's lowercase letters and hyphens
-    # Find where description starts (first capital letter after slug)
-    # Assume slug is lowercase letters, hyphens, maybe digits
-    slug_match = re.match(r'^([a-z0-9\-]+)', description)
-    if slug_match:
-        slug = slug_match.group(1)
-        desc_start = slug_match.end()
-        desc_text = description[desc_start:].strip()
+    if match['stars'] is not None:
+        author = match['author'].strip()
+        # Version is the number right before "v"; with a single number it doubles as stars
+        version = match['version'] or (match['stars'] if match['v'] else '0')
     else:
-        slug = ''
-        desc_text = description.strip()
-    
-    # After "by@": author rest
-    # Pattern: author downloads★ stars version
-    # Extract downloads (number with k), stars (digits), version (digits)
-    after_by_parts = after_by.strip().split()
-    if len(after_by_parts) < 3:
-        downloads = '0'
-        stars = '0'
+        author = match['bare_author']
         version = '0'
-    else:
-        downloads = after_by_parts[0]
-        # Find stars: after ★
-        # Actually stars is after ★ which might be in previous part
-        # Join and regex
-        combined = ' '.join(after_by_parts)
-        star_match = re.search(r'★\s*(\d+)', combined)
-        stars = star_match.group(1) if star_match else '0'
-        # version is digits before 'v'
-        version_match = re.search(r'(\d+)\s*v', combined)
-        version = version_match.group(1) if version_match else '0'
-    
     return {
-        'name': name,
-        'slug': slug,
-        'description': desc_text,
-        'downloads': downloads,
-        'stars': int(stars),
+        'name': match['name'].strip(),
+        'slug': match['slug'],
+        'description': match['desc'].strip(),
+        'author': author,
+        'downloads': match['downloads'] or '0',
+        'stars': int(match['stars'] or 0),
         'version': version
     }
 
-def main():
-    # Read JSON from stdin
-    data = sys.stdin.read()
+def parse_record(text):
+    parsed = parse_skill_text(text)
+    if parsed:
+        return parsed
+    # Fallback: store raw text
+    return {
+        'name': 'Unknown',
+        'slug': '',
+        'description': text,
+        'author': '',
+        'downloads': '0',
+        'stars': 0,
+        'version': '0'
+    }
+
+def load_texts(data):
+    """Whole-input mode: JSON, or a Python list literal (parsed safely, never eval'd)"""
     try:
-        texts = json.loads(data)
+        return json.loads(data)
     except json.JSONDecodeError:
-        # Maybe it's a Python list literal
-        texts = eval(data)
-    
-    skills = []
-    for text in texts:
-        if text == 'Skills':
+        return ast.literal_eval(data)
+
+def iter_json_array(stream, chunk_size=1 << 16):
+    """
+    Yield elements of a top-level JSON array as they are read, without
+    loading the whole input. Falls back to ast.literal_eval on the full
+    input if it turns out to be a Python list literal instead of JSON.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+    started = False
+    first = True
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    while True:
+        # Skip whitespace and separators, refilling as needed
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n' + (',' if started and not first else ''):
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            fill()
+
+        if pos >= len(buf):
+            if started:
+                raise ValueError('unterminated JSON array')
+            return
+
+        if not started:
+            if buf[pos] != '[':
+                raise ValueError('expected a JSON array')
+            started = True
+            pos += 1
             continue
-        parsed = parse_skill_text(text)
-        if parsed:
-            skills.append(parsed)
+
+        if buf[pos] == ']':
+            return
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if not eof:
+                fill()
+                continue
+            if first:
+                # The whole input is buffered by now; the '[' was consumed
+                yield from ast.literal_eval('[' + buf[pos:])
+                return
+            raise
+        # A value ending exactly at the buffer edge may be truncated (e.g. a number)
+        if end >= len(buf) and not eof:
+            fill()
+            continue
+        first = False
+        pos = end
+        yield value
+
+def top_skills(texts, k):
+    """Keep the k most-starred skills with a heap instead of a full sort"""
+    records = (parse_record(text) for text in texts if text != 'Skills')
+    return heapq.nlargest(k, records, key=lambda x: x['stars'])
+
+def write_csv(skills, out):
+    """
+    Same columns and format as clawhub_top20.csv: unquoted, with the description
+    (which may contain commas) as the last column, so split(',', 2) reads it back
+    """
+    out.write(','.join(CSV_HEADER) + '\n')
+    for rank, skill in enumerate(skills, 1):
+        description = ' '.join(skill['description'].split())
+        out.write(f"{rank},{skill['name']},{description}\n")
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse ClawHub skill texts')
+    parser.add_argument('--stream', action='store_true', help='parse stdin incrementally')
+    parser.add_argument('--top', type=int, default=100, help='number of skills to keep (default 100)')
+    parser.add_argument('--format', choices=('json', 'csv'), default='json')
+    parser.add_argument('input', nargs='?', help='input file (default: stdin)')
+    args = parser.parse_args()
+
+    src = open(args.input, encoding='utf-8') if args.input else sys.stdin
+    try:
+        if args.stream:
+            texts = iter_json_array(src)
         else:
-            # Fallback: store raw text
-            skills.append({
-                'name': 'Unknown',
-                'slug': '',
-                'description': text,
-                'downloads': '0',
-                'stars': 0,
-                'version': '0'
-            })
-    
-    # Sort by stars descending (already sorted but ensure)
-    skills.sort(key=lambda x: x['stars'], reverse=True)
-    
-    # Keep top 100
-    skills = skills[:100]
-    
-    # Output as JSON
-    print(json.dumps(skills, indent=2, ensure_ascii=False))
+            texts = load_texts(src.read())
+        skills = top_skills(texts, args.top)
+    finally:
+        if args.input:
+            src.close()
+
+    if args.format == 'csv':
+        write_csv(skills, sys.stdout)
+    else:
+        # Output as JSON
+        print(json.dumps(skills, indent=2, ensure_ascii=False))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()